@@ -14,7 +14,7 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.ytm_calculator import YTMCalculator, BondParams, calculate_ytm_from_price
+from core.ytm_calculator import YTMCalculator, BondParams, calculate_ytm_from_price, parse_maturity
 
 logger = logging.getLogger(__name__)
 
@@ -50,17 +50,19 @@ class CandleFetcher:
     
     MOEX_BASE_URL = "https://iss.moex.com/iss"
     
-    def __init__(self, timeout: int = 30, max_retries: int = 3):
+    def __init__(self, timeout: int = 30, max_retries: int = 3, pool_size: int = 16):
         """
         Инициализация
         
         Args:
             timeout: Таймаут запроса в секундах
             max_retries: Максимальное количество повторных попыток
+            pool_size: Число keep-alive соединений (сессия общая для потоков загрузки)
         """
         self.timeout = timeout
         self.max_retries = max_retries
         self._session = requests.Session()
+        self._session.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=pool_size))
         self._session.headers.update({
             "User-Agent": "OFZ-Analytics/1.0"
         })
@@ -295,19 +297,17 @@ class CandleFetcher:
         # Получаем НКД с MOEX
         accrued_interest = self._get_accrued_interest(bond_config.isin)
         
-        # Рассчитываем YTM для каждой цены
-        df['ytm_open'] = df['open'].apply(
-            lambda p: self._safe_calculate_ytm(p, bond_params, accrued_interest)
-        )
-        df['ytm_high'] = df['high'].apply(
-            lambda p: self._safe_calculate_ytm(p, bond_params, accrued_interest)
-        )
-        df['ytm_low'] = df['low'].apply(
-            lambda p: self._safe_calculate_ytm(p, bond_params, accrued_interest)
-        )
-        df['ytm_close'] = df['close'].apply(
-            lambda p: self._safe_calculate_ytm(p, bond_params, accrued_interest)
-        )
+        # Дата расчёта и НКД общие для всех свечей, поэтому YTM зависит
+        # только от цены: решаем уравнение один раз на уникальную цену
+        # (цены OHLC шагом 0.01 сильно повторяются)
+        ytm_by_price = {}
+        for column in ('open', 'high', 'low', 'close'):
+            ytm_values = []
+            for price in df[column].tolist():
+                if price not in ytm_by_price:
+                    ytm_by_price[price] = self._safe_calculate_ytm(price, bond_params, accrued_interest)
+                ytm_values.append(ytm_by_price[price])
+            df[f'ytm_{column}'] = pd.Series(ytm_values, index=df.index, dtype=float)
         
         # Основной YTM = YTM закрытия
         df['ytm'] = df['ytm_close']
@@ -365,7 +365,7 @@ class CandleFetcher:
             return self._bond_params_cache[isin]
         
         try:
-            maturity = datetime.strptime(bond_config.maturity_date, "%Y-%m-%d").date()
+            maturity = parse_maturity(bond_config)
         except (ValueError, TypeError):
             logger.warning(f"Неверная дата погашения для {isin}: {bond_config.maturity_date}")
             return None
@@ -30,17 +30,22 @@ class HistoryFetcher:
     
     MOEX_BASE_URL = "https://iss.moex.com/iss"
     
-    def __init__(self, timeout: int = 30, max_retries: int = 3):
+    # Сколько бумаг запрашивается в одном запросе торговых данных
+    TRADING_BATCH_SIZE = 10
+    
+    def __init__(self, timeout: int = 30, max_retries: int = 3, pool_size: int = 16):
         """
         Инициализация
         
         Args:
             timeout: Таймаут запроса в секундах
             max_retries: Максимальное количество повторных попыток
+            pool_size: Число keep-alive соединений (сессия общая для потоков загрузки)
         """
         self.timeout = timeout
         self.max_retries = max_retries
         self._session = requests.Session()
+        self._session.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=pool_size))
         self._session.headers.update({
             "User-Agent": "OFZ-Analytics/1.0"
         })
@@ -281,24 +286,9 @@ class HistoryFetcher:
             for row in md_rows:
                 board_id_idx = md_columns.index('BOARDID')
                 if row[board_id_idx] == 'TQOB':
-                    yield_idx = md_columns.index('YIELD')
-                    duration_idx = md_columns.index('DURATION')
-                    price_idx = md_columns.index('MARKETPRICE')
-                    
-                    ytm = row[yield_idx]
-                    duration = row[duration_idx]
-                    price = row[price_idx]
-                    
-                    if ytm is not None:
-                        result.update({
-                            "has_data": True,
-                            "yield": ytm,
-                            "duration": duration,
-                            "duration_years": duration / 365.25 if duration else None,
-                            "price": price,
-                            "last": price,
-                            "updated_at": datetime.now().isoformat()
-                        })
+                    row_data = self._parse_trading_row(md_columns, row)
+                    if row_data:
+                        result.update(row_data)
                         break
             
             return result
@@ -307,6 +297,84 @@ class HistoryFetcher:
             logger.error(f"Ошибка при получении торговых данных для {isin}: {e}")
             return {"isin": isin, "error": str(e), "has_data": False}
     
+    def get_trading_data_batch(
+        self,
+        isins: List[str],
+        board: str = "TQOB"
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Получить текущие торговые данные по нескольким облигациям
+        
+        Один запрос к MOEX на TRADING_BATCH_SIZE бумаг вместо запроса на каждую.
+        Ошибка запроса затрагивает только свою пачку; пустые ISIN (None, "")
+        в запрос не попадают и возвращаются с has_data=False.
+        
+        Args:
+            isins: ISIN коды облигаций
+            board: Торговая площадка
+            
+        Returns:
+            Словарь {isin: торговые данные} в формате get_trading_data
+        """
+        results = {isin: {"isin": isin, "has_data": False} for isin in isins}
+        url = f"{self.MOEX_BASE_URL}/engines/stock/markets/bonds/boards/{board}/securities.json"
+        
+        valid_isins = [isin for isin in isins if isin]
+        if len(valid_isins) < len(isins):
+            logger.warning(f"Пропущено {len(isins) - len(valid_isins)} пустых ISIN")
+        
+        for start in range(0, len(valid_isins), self.TRADING_BATCH_SIZE):
+            chunk = valid_isins[start:start + self.TRADING_BATCH_SIZE]
+            
+            try:
+                params = {
+                    "iss.meta": "off",
+                    "iss.only": "marketdata",
+                    "securities": ",".join(chunk)
+                }
+                response = self._make_request(url, params)
+                marketdata = response.json().get("marketdata", {})
+                md_columns = marketdata.get("columns", [])
+                secid_idx = md_columns.index('SECID')
+                
+                for row in marketdata.get("data", []):
+                    isin = row[secid_idx]
+                    if isin in results:
+                        row_data = self._parse_trading_row(md_columns, row)
+                        if row_data:
+                            results[isin].update(row_data)
+                            
+            except Exception as e:
+                logger.error(f"Ошибка при получении торговых данных для {', '.join(chunk)}: {e}")
+                for isin in chunk:
+                    results[isin] = {"isin": isin, "error": str(e), "has_data": False}
+        
+        return results
+    
+    @staticmethod
+    def _parse_trading_row(md_columns: List[str], row: List[Any]) -> Optional[Dict[str, Any]]:
+        """
+        Торговые данные из строки marketdata
+        
+        Returns:
+            Словарь с YTM, дюрацией и ценой или None, если YTM нет
+        """
+        ytm = row[md_columns.index('YIELD')]
+        if ytm is None:
+            return None
+        
+        duration = row[md_columns.index('DURATION')]
+        price = row[md_columns.index('MARKETPRICE')]
+        return {
+            "has_data": True,
+            "yield": ytm,
+            "duration": duration,
+            "duration_years": duration / 365.25 if duration else None,
+            "price": price,
+            "last": price,
+            "updated_at": datetime.now().isoformat()
+        }
+    
     def _make_request(self, url: str, params: Dict) -> requests.Response:
         """
         Выполнить запрос с повторными попытками
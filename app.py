@@ -7,6 +7,10 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, date, timedelta
 from typing import Dict, List, Any, Optional
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from types import MappingProxyType
 import logging
 import sys
 import os
@@ -25,7 +29,11 @@ from core.database import (
     save_intraday_snapshot, load_intraday_history, 
     get_saved_data_info, cleanup_old_data
 )
-from components.charts import ChartBuilder
+from components.charts import (
+    ChartBuilder, downsample_xy, hline_shape, band_shapes, line_trace_class,
+    COMPACT_MARGIN, FILL_THRESHOLD, FILL_MAX_POINTS, PANDAS_HASH_FUNCS
+)
+from components.styles import apply_styles
 
 # Настройка логирования
 logging.basicConfig(
@@ -34,6 +42,28 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Число параллельных запросов к MOEX при полном обновлении БД
+UPDATE_WORKERS = 8
+
+# Подписи опций sidebar (format_func без лямбд и форматирования на каждом rerun)
+DATA_MODE_LABELS = {
+    "daily": "📅 Данные биржи (day close YTM)",
+    "intraday": "⏱️ Внутридневные (свечи)",
+}
+CANDLE_INTERVAL_LABELS = {"1": "1 минута", "10": "10 минут", "60": "1 час"}
+CANDLE_INTERVAL_NAMES = {"1": "1-минутных", "10": "10-минутных", "60": "часовых"}
+
+# Интервал свечей -> (макс. дней истории, дней по умолчанию)
+# 1 минута: макс 3 дня (много данных)
+# 10 минут: макс 30 дней
+# 1 час: макс 365 дней (год) - пагинация работает
+INTRADAY_PERIOD_LIMITS = MappingProxyType({
+    "1": (3, 1),
+    "10": (30, 7),
+    "60": (365, 30),
+})
+PERIOD_LABELS = {days: f"{days // 365} год(а)" for days in (365, 730)}
+
 # Конфигурация страницы
 st.set_page_config(
     page_title="OFZ Spread Analytics",
@@ -43,76 +73,62 @@ st.set_page_config(
 )
 
 # CSS стили
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 2.5rem;
-        font-weight: bold;
-        margin-bottom: 1rem;
-    }
-    .metric-card {
-        background: #f8f9fa;
-        padding: 15px;
-        border-radius: 10px;
-        border-left: 4px solid #1f77b4;
-    }
-    .signal-buy {
-        background: linear-gradient(135deg, #d4edda, #c3e6cb);
-        border-left: 4px solid #28a745;
-    }
-    .signal-sell {
-        background: linear-gradient(135deg, #f8d7da, #f5c6cb);
-        border-left: 4px solid #dc3545;
-    }
-    .signal-neutral {
-        background: linear-gradient(135deg, #fff3cd, #ffeeba);
-        border-left: 4px solid #ffc107;
-    }
-    .stMetric > div {
-        background: #f8f9fa;
-        padding: 10px;
-        border-radius: 8px;
-        color: #333;
-    }
-    .stMetric label {
-        color: #555 !important;
-    }
-    .stMetric [data-testid="stMetricValue"] {
-        color: #333 !important;
-    }
-    .mode-badge {
-        display: inline-block;
-        padding: 4px 12px;
-        border-radius: 15px;
-        font-size: 0.85em;
-        font-weight: bold;
-        margin-left: 10px;
-    }
-    .mode-daily {
-        background: #3498db;
-        color: white;
-    }
-    .mode-intraday {
-        background: #e74c3c;
-        color: white;
-    }
-</style>
-""", unsafe_allow_html=True)
+apply_styles()
+
+
+def get_years_to_maturity(maturity_str: str, today_ordinal: Optional[int] = None) -> float:
+    """
+    Вычисляет годы до погашения
+    
+    Args:
+        maturity_str: Дата погашения YYYY-MM-DD
+        today_ordinal: Сегодняшняя дата (date.toordinal), общая на проход скрипта
+    """
+    if today_ordinal is None:
+        today_ordinal = date.today().toordinal()
+    return _years_to_maturity(maturity_str, today_ordinal)
 
 
-def get_years_to_maturity(maturity_str: str) -> float:
-    """Вычисляет годы до погашения"""
+@lru_cache(maxsize=1024)
+def _years_to_maturity(maturity_str: str, today_ordinal: int) -> float:
+    """Годы до погашения (кэш по дате: результат меняется раз в сутки)"""
+    if not maturity_str:
+        return 0
     try:
-        maturity = datetime.strptime(maturity_str, '%Y-%m-%d')
-        return round((maturity - datetime.now()).days / 365.25, 1)
-    except:
+        maturity = date.fromisoformat(maturity_str)
+    except (ValueError, TypeError):
         return 0
+    return round((maturity.toordinal() - today_ordinal) / 365.25, 1)
 
 
-def format_bond_label(bond: BondConfig, ytm: float = None, duration_years: float = None) -> str:
+def format_bond_label(
+    bond: BondConfig,
+    ytm: float = None,
+    duration_years: float = None,
+    today_ordinal: Optional[int] = None
+) -> str:
     """Форматирует метку облигации с YTM, дюрацией и годами до погашения"""
-    years = get_years_to_maturity(bond.maturity_date)
-    parts = [f"{bond.name}"]
+    if today_ordinal is None:
+        today_ordinal = date.today().toordinal()
+    return _format_bond_label(bond.name, bond.maturity_date, ytm, duration_years, today_ordinal)
+
+
+@lru_cache(maxsize=1024)
+def _format_bond_label(
+    name: str,
+    maturity_str: str,
+    ytm: Optional[float],
+    duration_years: Optional[float],
+    today_ordinal: int
+) -> str:
+    """Метка облигации (кэшируется: при перезапусках скрипта данные те же)"""
+    years = _years_to_maturity(maturity_str, today_ordinal)
+    
+    # Основной случай (есть торговые данные) - одна f-строка без списка
+    if ytm is not None and duration_years is not None:
+        return f"{name} | YTM: {ytm:.2f}% | Дюр: {duration_years:.1f}г. | {years}г. до погашения"
+    
+    parts = [f"{name}"]
     
     if ytm is not None:
         parts.append(f"YTM: {ytm:.2f}%")
@@ -197,23 +213,44 @@ def init_session_state():
         st.session_state.updating_db = False
 
 
-def get_bonds_list() -> List:
+@dataclass(slots=True)
+class BondItem:
+    """Облигация для отображения (атрибуты как у BondConfig)"""
+    isin: Optional[str]
+    name: str = ''
+    maturity_date: str = ''
+    coupon_rate: Optional[float] = None
+    face_value: float = 1000
+    coupon_frequency: int = 2
+    issue_date: str = ''
+    day_count_convention: str = 'ACT/ACT'
+    
+    def __post_init__(self):
+        # Без названия показываем ISIN, а не пустую/None метку
+        if not self.name:
+            self.name = self.isin or ''
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "BondItem":
+        """Создать из словаря облигации (session_state.bonds)"""
+        # Позиционные аргументы в порядке полей: без разбора kwargs
+        get = data.get
+        return cls(
+            get('isin'),
+            get('name', ''),
+            get('maturity_date', ''),
+            get('coupon_rate'),
+            get('face_value', 1000),
+            get('coupon_frequency', 2),
+            get('issue_date', ''),
+            get('day_count_convention', 'ACT/ACT')
+        )
+
+
+def get_bonds_list() -> List[BondItem]:
     """Получить список облигаций для отображения"""
     bonds_dict = st.session_state.get('bonds', {})
-    
-    # Преобразуем в список объектов с атрибутами
-    class BondItem:
-        def __init__(self, data):
-            self.isin = data.get('isin')
-            self.name = data.get('name', '')
-            self.maturity_date = data.get('maturity_date', '')
-            self.coupon_rate = data.get('coupon_rate')
-            self.face_value = data.get('face_value', 1000)
-            self.coupon_frequency = data.get('coupon_frequency', 2)
-            self.issue_date = data.get('issue_date', '')
-            self.day_count_convention = data.get('day_count_convention', 'ACT/ACT')
-    
-    return [BondItem(bond_data) for bond_data in bonds_dict.values()]
+    return [BondItem.from_dict(bond_data) for bond_data in bonds_dict.values()]
 
 
 @st.cache_resource
@@ -247,10 +284,16 @@ def get_signal_generator():
 
 
 @st.cache_data(ttl=300)
-def fetch_trading_data_cached(secid: str) -> Dict:
-    """Получить торговые данные с кэшированием"""
+def fetch_trading_data_batch_cached(secids: tuple) -> Dict[str, Dict]:
+    """Получить торговые данные по всем облигациям одним запросом (с кэшированием)"""
     fetcher = get_history_fetcher()
-    return fetcher.get_trading_data(secid)
+    return fetcher.get_trading_data_batch(list(secids))
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_saved_data_info_cached() -> Dict[str, Any]:
+    """Информация о сохранённых данных (COUNT по таблицам БД, кэш на минуту)"""
+    return get_saved_data_info()
 
 
 @st.cache_data(ttl=300)
@@ -431,66 +474,134 @@ def fetch_candle_data_cached(isin: str, bond_config_dict: Dict, interval: str, d
 
 def calculate_spread_stats(spread_series: pd.Series) -> Dict:
     """Вычисляет статистику спреда"""
+    values = spread_series.to_numpy(dtype=np.float64)
+    valid = values[~np.isnan(values)]
+    
+    if not valid.size:
+        nan_stats = dict.fromkeys(['mean', 'median', 'std', 'min', 'max', 'p10', 'p25', 'p75', 'p90'], np.nan)
+        return {**nan_stats, 'current': values[-1]}
+    
+    # Медиана и перцентили одной сортировкой, остальное - по тому же массиву
+    p10, p25, median, p75, p90 = np.quantile(valid, [0.10, 0.25, 0.50, 0.75, 0.90])
     return {
-        'mean': spread_series.mean(),
-        'median': spread_series.median(),
-        'std': spread_series.std(),
-        'min': spread_series.min(),
-        'max': spread_series.max(),
-        'p10': spread_series.quantile(0.10),
-        'p25': spread_series.quantile(0.25),
-        'p75': spread_series.quantile(0.75),
-        'p90': spread_series.quantile(0.90),
-        'current': spread_series.iloc[-1]
+        'mean': valid.mean(),
+        'median': median,
+        'std': valid.std(ddof=1) if valid.size > 1 else np.nan,
+        'min': valid.min(),
+        'max': valid.max(),
+        'p10': p10,
+        'p25': p25,
+        'p75': p75,
+        'p90': p90,
+        'current': values[-1]
     }
 
 
+# Раскладка блока статистики спреда: колонки по две метрики
+SPREAD_STATS_LAYOUT = [
+    [("Текущий спред", 'current'), ("Среднее", 'mean')],
+    [("P10", 'p10'), ("P25", 'p25')],
+    [("P75", 'p75'), ("P90", 'p90')],
+    [("Минимум", 'min'), ("Максимум", 'max')],
+]
+
+
+def spread_stats_html(stats: Dict) -> str:
+    """HTML блока статистики спреда (один элемент вместо колонок с st.metric)"""
+    cards = []
+    for column in SPREAD_STATS_LAYOUT:
+        metrics = "".join(
+            f'<div class="label">{label}</div>'
+            f'<div class="value">{stats[key]:.2f} б.п.</div>'
+            for label, key in column
+        )
+        cards.append(f'<div class="metric-card">{metrics}</div>')
+    return f'<div class="stats-grid">{"".join(cards)}</div>'
+
+
+# HTML карточки сигнала; поля подставляются из словаря generate_signal
+SIGNAL_CARD_HTML = (
+    '<div style="background-color: {color}20; padding: 20px; border-radius: 10px; border-left: 5px solid {color};">'
+    '<h3 style="margin:0; color: {color};">📈 {signal}</h3>'
+    '<p style="margin:5px 0 0 0; font-weight: bold;">{action}</p>'
+    '<p style="margin:5px 0 0 0; font-size: 0.9em;">{reason}</p>'
+    '<p style="margin:5px 0 0 0; font-size: 0.8em; color: gray;">Сила сигнала: {strength}</p>'
+    '</div>'
+)
+
+# Шаблоны сигналов: неизменяемые поля и шаблон причины
+_SELL_BUY = {
+    'signal': 'SELL_BUY',
+    'action': 'ПРОДАТЬ Облигацию 1, КУПИТЬ Облигацию 2',
+    'reason': 'Спред {spread:.2f} б.п. ниже P25 ({p25:.2f} б.п.) — Облигация 1 переоценена относительно Облигации 2',
+    'color': '#FF6B6B',
+}
+_BUY_SELL = {
+    'signal': 'BUY_SELL',
+    'action': 'КУПИТЬ Облигацию 1, ПРОДАТЬ Облигацию 2',
+    'reason': 'Спред {spread:.2f} б.п. выше P75 ({p75:.2f} б.п.) — Облигация 1 недооценена относительно Облигации 2',
+    'color': '#4ECDC4',
+}
+_NEUTRAL = {
+    'signal': 'NEUTRAL',
+    'action': 'Удерживать позиции',
+    'reason': 'Спред {spread:.2f} б.п. в нормальном диапазоне [P25={p25:.2f}, P75={p75:.2f}]',
+    'color': '#95A5A6',
+}
+
+# (ниже P25, выше P75) -> шаблон; ниже P25 имеет приоритет
+_SIGNAL_TEMPLATES = {
+    (True, True): _SELL_BUY,
+    (True, False): _SELL_BUY,
+    (False, True): _BUY_SELL,
+    (False, False): _NEUTRAL,
+}
+
+
 def generate_signal(current_spread: float, p10: float, p25: float, p75: float, p90: float) -> Dict:
     """Генерирует торговый сигнал"""
-    if current_spread < p25:
-        return {
-            'signal': 'SELL_BUY',
-            'action': 'ПРОДАТЬ Облигацию 1, КУПИТЬ Облигацию 2',
-            'reason': f'Спред {current_spread:.2f} б.п. ниже P25 ({p25:.2f} б.п.) — Облигация 1 переоценена относительно Облигации 2',
-            'color': '#FF6B6B',
-            'strength': 'Сильный' if current_spread < p10 else 'Средний'
-        }
-    elif current_spread > p75:
-        return {
-            'signal': 'BUY_SELL',
-            'action': 'КУПИТЬ Облигацию 1, ПРОДАТЬ Облигацию 2',
-            'reason': f'Спред {current_spread:.2f} б.п. выше P75 ({p75:.2f} б.п.) — Облигация 1 недооценена относительно Облигации 2',
-            'color': '#4ECDC4',
-            'strength': 'Сильный' if current_spread > p90 else 'Средний'
-        }
+    template = _SIGNAL_TEMPLATES[(current_spread < p25, current_spread > p75)]
+    
+    if template is _SELL_BUY:
+        strength = 'Сильный' if current_spread < p10 else 'Средний'
+    elif template is _BUY_SELL:
+        strength = 'Сильный' if current_spread > p90 else 'Средний'
     else:
-        return {
-            'signal': 'NEUTRAL',
-            'action': 'Удерживать позиции',
-            'reason': f'Спред {current_spread:.2f} б.п. в нормальном диапазоне [P25={p25:.2f}, P75={p75:.2f}]',
-            'color': '#95A5A6',
-            'strength': 'Нет сигнала'
-        }
+        strength = 'Нет сигнала'
+    
+    return {
+        **template,
+        'reason': template['reason'].format(spread=current_spread, p25=p25, p75=p75),
+        'strength': strength,
+    }
 
 
+@st.cache_data(ttl=300, show_spinner=False, hash_funcs=PANDAS_HASH_FUNCS)
 def create_ytm_chart(df1: pd.DataFrame, df2: pd.DataFrame, bond1_name: str, bond2_name: str, is_intraday: bool = False):
-    """Создаёт график YTM"""
+    """Создаёт график YTM (кэшируется по содержимому данных)"""
     import plotly.graph_objects as go
     
     fig = go.Figure()
     
-    # Определяем колонки
-    ytm_col1 = 'ytm_close' if 'ytm_close' in df1.columns else 'ytm'
-    ytm_col2 = 'ytm_close' if 'ytm_close' in df2.columns else 'ytm'
+    # Длинные ряды (intraday за год) прореживаются LTTB до ширины графика;
+    # пустые ряды пропускаются
+    lines = []
+    for df, name, color in ((df1, bond1_name, '#3498DB'), (df2, bond2_name, '#E74C3C')):
+        if df.empty:
+            continue
+        ytm_col = 'ytm_close' if 'ytm_close' in df.columns else 'ytm'
+        x, y = downsample_xy(df.index, df[ytm_col])
+        lines.append((x, y, name, color))
+    
+    # SVG или WebGL - по числу точек на графике
+    scatter = line_trace_class(sum(len(x) for x, _, _, _ in lines))
+    traces = [
+        scatter(x=x, y=y, name=name, line=dict(color=color, width=2))
+        for x, y, name, color in lines
+    ]
     
-    fig.add_trace(go.Scatter(
-        x=df1.index, y=df1[ytm_col1],
-        name=bond1_name, line=dict(color='#3498DB', width=2)
-    ))
-    fig.add_trace(go.Scatter(
-        x=df2.index, y=df2[ytm_col2],
-        name=bond2_name, line=dict(color='#E74C3C', width=2)
-    ))
+    if traces:
+        fig.add_traces(traces)
     
     title = 'Доходность к погашению (YTM) - Внутридневные данные' if is_intraday else 'Доходность к погашению (YTM)'
     x_title = 'Время' if is_intraday else 'Дата'
@@ -501,58 +612,116 @@ def create_ytm_chart(df1: pd.DataFrame, df2: pd.DataFrame, bond1_name: str, bond
         yaxis_title='Доходность, %',
         hovermode='x unified',
         height=400,
-        margin=dict(l=0, r=0, t=40, b=0)
+        margin=COMPACT_MARGIN
     )
     
     return fig
 
 
+@st.cache_data(ttl=300, show_spinner=False, hash_funcs=PANDAS_HASH_FUNCS)
 def create_spread_chart(merged_df: pd.DataFrame, stats: Dict, is_intraday: bool = False):
-    """Создаёт график спреда"""
+    """Создаёт график спреда (кэшируется по содержимому данных)"""
     import plotly.graph_objects as go
     
     fig = go.Figure()
     
-    # Линии перцентилей
-    fig.add_hline(y=stats['mean'], line_dash='dash', line_color='gray',
-                  annotation_text=f"Среднее: {stats['mean']:.2f}")
-    fig.add_hline(y=stats['p25'], line_dash='dot', line_color='green',
-                  annotation_text=f"P25: {stats['p25']:.2f}")
-    fig.add_hline(y=stats['p75'], line_dash='dot', line_color='red',
-                  annotation_text=f"P75: {stats['p75']:.2f}")
-    
-    # Основной график спреда
-    fig.add_trace(go.Scatter(
-        x=merged_df['datetime'] if 'datetime' in merged_df.columns else merged_df['date'],
-        y=merged_df['spread'],
-        name='Спред',
-        line=dict(color='#9B59B6', width=2),
-        fill='tozeroy',
-        fillcolor='rgba(155, 89, 182, 0.1)'
-    ))
-    
-    # Текущая точка
-    x_current = merged_df['datetime'].iloc[-1] if 'datetime' in merged_df.columns else merged_df['date'].iloc[-1]
-    fig.add_trace(go.Scatter(
-        x=[x_current],
-        y=[merged_df['spread'].iloc[-1]],
-        mode='markers',
-        marker=dict(size=12, color='yellow', line=dict(width=2, color='black')),
-        name='Текущий'
-    ))
-    
     title = 'Спред доходности (базисные пункты) - Внутридневные данные' if is_intraday else 'Спред доходности (базисные пункты)'
     x_title = 'Время' if is_intraday else 'Дата'
     
-    fig.update_layout(
+    layout = dict(
         title=title,
         xaxis_title=x_title,
         yaxis_title='Спред, б.п.',
         hovermode='x unified',
         height=400,
-        margin=dict(l=0, r=0, t=40, b=0)
+        margin=COMPACT_MARGIN
+    )
+    
+    # Нет данных - пустой график без перцентилей и трейсов
+    if merged_df.empty:
+        fig.update_layout(**layout)
+        return fig
+    
+    # Перцентили: полосы P10-P90 и P25-P75 и линия среднего
+    # (добавляются одним update_layout ниже)
+    shapes = band_shapes([
+        (stats['p10'], stats['p90'], 'rgba(149, 165, 166, 0.08)'),
+        (stats['p25'], stats['p75'], 'rgba(149, 165, 166, 0.18)'),
+    ]) + [hline_shape(stats['mean'], 'gray', 'dash')]
+    
+    # Подписи уровней - метками на правой оси (одна ось вместо аннотаций)
+    levels = (('p25', 'P25'), ('mean', 'Среднее'), ('p75', 'P75'))
+    level_axis = dict(
+        overlaying='y',
+        matches='y',
+        side='right',
+        showgrid=False,
+        zeroline=False,
+        automargin=True,
+        tickmode='array',
+        tickvals=[stats[key] for key, _ in levels],
+        ticktext=[f"{label}: {stats[key]:.2f}" for key, label in levels]
     )
     
+    # Ось X и спред как массивы numpy (колонка времени выбирается один раз)
+    x_col = 'datetime' if 'datetime' in merged_df.columns else 'date'
+    x_vals = merged_df[x_col].to_numpy()
+    spread_vals = merged_df['spread'].to_numpy(dtype=np.float64)
+    
+    # Основной график спреда (SVG или WebGL - по числу точек)
+    x_spread, y_spread = downsample_xy(x_vals, spread_vals)
+    scatter = line_trace_class(len(x_spread))
+    
+    traces = []
+    if len(spread_vals) > FILL_THRESHOLD:
+        # Длинный ряд: заливка - отдельный грубый трейс под линией,
+        # чтобы не строить полигон на все точки линии
+        x_fill, y_fill = downsample_xy(x_vals, spread_vals, FILL_MAX_POINTS)
+        traces.append(go.Scatter(
+            x=x_fill,
+            y=y_fill,
+            mode='none',
+            fill='tozeroy',
+            fillcolor='rgba(155, 89, 182, 0.1)',
+            hoverinfo='skip',
+            showlegend=False
+        ))
+        fill = {}
+    else:
+        fill = dict(fill='tozeroy', fillcolor='rgba(155, 89, 182, 0.1)')
+    
+    traces += [
+        scatter(
+            x=x_spread,
+            y=y_spread,
+            name='Спред',
+            line=dict(color='#9B59B6', width=2),
+            **fill
+        ),
+        # Текущая точка
+        go.Scatter(
+            x=[x_vals[-1]],
+            y=[spread_vals[-1]],
+            mode='markers',
+            marker=dict(size=12, color='yellow', line=dict(width=2, color='black')),
+            name='Текущий'
+        ),
+        # Невидимая точка на правой оси: Plotly рисует метки только
+        # у осей, к которым привязан хотя бы один трейс
+        go.Scatter(
+            x=[x_vals[-1]],
+            y=[stats['mean']],
+            yaxis='y2',
+            mode='markers',
+            marker=dict(opacity=0),
+            hoverinfo='skip',
+            showlegend=False
+        ),
+    ]
+    fig.add_traces(traces)
+    
+    fig.update_layout(**layout, shapes=shapes, yaxis2=level_axis)
+    
     return fig
 
 
@@ -607,53 +776,64 @@ def update_database_full(bonds_list: List = None, progress_callback=None) -> Dic
         'errors': []
     }
     
-    # total_steps: дневные YTM + intraday (3 интервала для каждой)
-    total_steps = len(bonds) * 4
-    current_step = 0
-    
-    # 1. Дневные YTM для всех облигаций (1 год)
-    for bond in bonds:
-        try:
-            if progress_callback:
-                progress_callback(current_step / total_steps, f"Загрузка дневных YTM: {bond.name}")
-            
-            df = fetcher.fetch_ytm_history(bond.isin, start_date=date.today() - timedelta(days=365))
-            if not df.empty:
-                saved = db.save_daily_ytm(bond.isin, df)
-                stats['daily_ytm_saved'] += saved
-        except Exception as e:
-            stats['errors'].append(f"Daily YTM {bond.name}: {str(e)}")
-        
-        current_step += 1
-    
-    # 2. Intraday YTM для всех облигаций и интервалов
+    # Дневные YTM (1 год) + intraday по 3 интервалам для каждой облигации
     intervals = [
         ("60", CandleInterval.MIN_60, 30),  # часовые за 30 дней
         ("10", CandleInterval.MIN_10, 7),   # 10-минутные за 7 дней
         ("1", CandleInterval.MIN_1, 3),     # минутные за 3 дня
     ]
-    
+    tasks = []
     for bond in bonds:
-        for interval_str, interval_enum, days in intervals:
-            try:
-                if progress_callback:
-                    progress_callback(current_step / total_steps, f"Загрузка {interval_str}мин свечей: {bond.name}")
-                
-                df = candle_fetcher.fetch_candles(
-                    bond.isin,
-                    bond_config=bond,
-                    interval=interval_enum,
-                    start_date=date.today() - timedelta(days=days),
-                    end_date=date.today()
-                )
-                
-                if not df.empty and 'ytm_close' in df.columns:
-                    saved = db.save_intraday_ytm(bond.isin, interval_str, df)
-                    stats['intraday_ytm_saved'] += saved
-            except Exception as e:
-                stats['errors'].append(f"Intraday YTM {bond.name} {interval_str}min: {str(e)}")
+        tasks.append((bond, None))
+        tasks.extend((bond, interval) for interval in intervals)
+    
+    total_steps = len(tasks)
+    
+    def fetch_task(bond, interval):
+        """Загрузить данные одной задачи (выполняется в пуле потоков)"""
+        if interval is None:
+            return fetcher.fetch_ytm_history(bond.isin, start_date=date.today() - timedelta(days=365))
+        
+        _, interval_enum, days = interval
+        return candle_fetcher.fetch_candles(
+            bond.isin,
+            bond_config=bond,
+            interval=interval_enum,
+            start_date=date.today() - timedelta(days=days),
+            end_date=date.today()
+        )
+    
+    # Запросы к MOEX идут параллельно; запись в SQLite и прогресс -
+    # в основном потоке по мере завершения загрузок. Каждое сохранение -
+    # своя короткая транзакция: блокировка записи не держится на время загрузки
+    with ThreadPoolExecutor(max_workers=UPDATE_WORKERS) as executor:
+        futures = {executor.submit(fetch_task, *task): task for task in tasks}
+        
+        for current_step, future in enumerate(as_completed(futures), start=1):
+            bond, interval = futures[future]
+            
+            if interval is None:
+                try:
+                    df = future.result()
+                    if not df.empty:
+                        saved = db.save_daily_ytm(bond.isin, df)
+                        stats['daily_ytm_saved'] += saved
+                except Exception as e:
+                    stats['errors'].append(f"Daily YTM {bond.name}: {str(e)}")
+                message = f"Загружены дневные YTM: {bond.name}"
+            else:
+                interval_str = interval[0]
+                try:
+                    df = future.result()
+                    if not df.empty and 'ytm_close' in df.columns:
+                        saved = db.save_intraday_ytm(bond.isin, interval_str, df)
+                        stats['intraday_ytm_saved'] += saved
+                except Exception as e:
+                    stats['errors'].append(f"Intraday YTM {bond.name} {interval_str}min: {str(e)}")
+                message = f"Загружены {interval_str}мин свечи: {bond.name}"
             
-            current_step += 1
+            if progress_callback:
+                progress_callback(current_step / total_steps, message)
     
     if progress_callback:
         progress_callback(1.0, "Готово!")
@@ -668,6 +848,9 @@ def main():
     # Получаем облигации из БД (через session_state)
     bonds = get_bonds_list()
     
+    # Одна дата на весь проход скрипта (метки и годы до погашения)
+    today_ordinal = date.today().toordinal()
+    
     # ==========================================
     # БОКОВАЯ ПАНЕЛЬ
     # ==========================================
@@ -685,7 +868,7 @@ def main():
         data_mode = st.radio(
             "Источник YTM",
             ["daily", "intraday"],
-            format_func=lambda x: "📅 Данные биржи (day close YTM)" if x == "daily" else "⏱️ Внутридневные (свечи)",
+            format_func=DATA_MODE_LABELS.__getitem__,
             index=0 if st.session_state.data_mode == "daily" else 1
         )
         st.session_state.data_mode = data_mode
@@ -695,17 +878,12 @@ def main():
             candle_interval = st.select_slider(
                 "Интервал свечей",
                 options=["1", "10", "60"],
-                format_func=lambda x: {
-                    "1": "1 минута",
-                    "10": "10 минут",
-                    "60": "1 час"
-                }[x],
+                format_func=CANDLE_INTERVAL_LABELS.__getitem__,
                 value=st.session_state.candle_interval
             )
             st.session_state.candle_interval = candle_interval
             
-            interval_names = {"1": "1-минутных", "10": "10-минутных", "60": "часовых"}
-            st.info(f"📊 YTM рассчитывается из цен {interval_names[candle_interval]} свечей")
+            st.info(f"📊 YTM рассчитывается из цен {CANDLE_INTERVAL_NAMES[candle_interval]} свечей")
         
         st.divider()
         
@@ -714,22 +892,21 @@ def main():
             st.warning("Нет избранных облигаций. Нажмите 'Управление облигациями' для выбора.")
             st.stop()
         
-        # Получаем данные для отображения в dropdown
-        bond_labels = []
-        bond_trading_data = {}
+        # Получаем данные для отображения в dropdown (один запрос на все облигации)
+        bond_trading_data = fetch_trading_data_batch_cached(tuple(b.isin for b in bonds))
         
+        bond_labels = []
         for b in bonds:
-            data = fetch_trading_data_cached(b.isin)
-            bond_trading_data[b.isin] = data
+            data = bond_trading_data[b.isin]
             if data.get('has_data') and data.get('yield'):
-                bond_labels.append(format_bond_label(b, data['yield'], data.get('duration_years')))
+                bond_labels.append(format_bond_label(b, data['yield'], data.get('duration_years'), today_ordinal))
             else:
-                bond_labels.append(format_bond_label(b))
+                bond_labels.append(format_bond_label(b, today_ordinal=today_ordinal))
         
         bond1_idx = st.selectbox(
             "Облигация 1",
             range(len(bonds)),
-            format_func=lambda i: bond_labels[i],
+            format_func=bond_labels.__getitem__,
             index=st.session_state.selected_bond1
         )
         st.session_state.selected_bond1 = bond1_idx
@@ -737,7 +914,7 @@ def main():
         bond2_idx = st.selectbox(
             "Облигация 2",
             range(len(bonds)),
-            format_func=lambda i: bond_labels[i],
+            format_func=bond_labels.__getitem__,
             index=st.session_state.selected_bond2
         )
         st.session_state.selected_bond2 = bond2_idx
@@ -747,24 +924,13 @@ def main():
             period = st.radio(
                 "Период анализа",
                 [365, 730],
-                format_func=lambda x: f"{x // 365} год(а)",
+                format_func=PERIOD_LABELS.__getitem__,
                 index=0 if st.session_state.period == 365 else 1
             )
             st.session_state.period = period
         else:
             # Для внутридневного режима - зависит от интервала
-            # 1 минута: макс 3 дня (много данных)
-            # 10 минут: макс 30 дней
-            # 1 час: макс 365 дней (год) - пагинация работает
-            if candle_interval == "1":
-                max_days = 3
-                default_days = 1
-            elif candle_interval == "10":
-                max_days = 30
-                default_days = 7
-            else:  # 60 минут (1 час)
-                max_days = 365
-                default_days = 30
+            max_days, default_days = INTRADAY_PERIOD_LIMITS[candle_interval]
             
             period = st.slider(
                 f"Дней истории (макс {max_days} для {candle_interval} мин)",
@@ -827,13 +993,14 @@ def main():
             
             # Информация о сохранённых данных
             with st.expander("📁 Сохранённые данные"):
-                info = get_saved_data_info()
+                info = get_saved_data_info_cached()
                 st.write(f"Всего файлов: {info['total_files']}")
                 if info['newest']:
                     st.write(f"Последние данные: {info['newest']}")
                 
                 if st.button("🗑️ Очистить старые данные", key="cleanup_data"):
                     cleanup_old_data(days_to_keep=7)
+                    get_saved_data_info_cached.clear()
                     st.success("Старые данные удалены!")
         
         st.divider()
@@ -1042,12 +1209,12 @@ def main():
     # ==========================================
     col1, col2 = st.columns(2)
     
-    years1 = get_years_to_maturity(bond1.maturity_date)
-    years2 = get_years_to_maturity(bond2.maturity_date)
+    years1 = get_years_to_maturity(bond1.maturity_date, today_ordinal)
+    years2 = get_years_to_maturity(bond2.maturity_date, today_ordinal)
     
     with col1:
         if current1:
-            title1 = format_bond_label(bond1, current1['yield'], current1.get('duration_years'))
+            title1 = format_bond_label(bond1, current1['yield'], current1.get('duration_years'), today_ordinal)
             st.subheader(f"📈 {title1}")
             metric_col1, metric_col2, metric_col3 = st.columns(3)
             with metric_col1:
@@ -1076,7 +1243,7 @@ def main():
     
     with col2:
         if current2:
-            title2 = format_bond_label(bond2, current2['yield'], current2.get('duration_years'))
+            title2 = format_bond_label(bond2, current2['yield'], current2.get('duration_years'), today_ordinal)
             st.subheader(f"📈 {title2}")
             metric_col1, metric_col2, metric_col3 = st.columns(3)
             with metric_col1:
@@ -1186,14 +1353,7 @@ def main():
     # Отображение сигнала
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
-        st.markdown(f"""
-        <div style="background-color: {signal['color']}20; padding: 20px; border-radius: 10px; border-left: 5px solid {signal['color']};">
-            <h3 style="margin:0; color: {signal['color']};">📈 {signal['signal']}</h3>
-            <p style="margin:5px 0 0 0; font-weight: bold;">{signal['action']}</p>
-            <p style="margin:5px 0 0 0; font-size: 0.9em;">{signal['reason']}</p>
-            <p style="margin:5px 0 0 0; font-size: 0.8em; color: gray;">Сила сигнала: {signal['strength']}</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(SIGNAL_CARD_HTML.format_map(signal), unsafe_allow_html=True)
     
     st.divider()
     
@@ -1211,19 +1371,7 @@ def main():
     # ==========================================
     st.subheader("📊 Статистика спреда")
     
-    stat_col1, stat_col2, stat_col3, stat_col4 = st.columns(4)
-    with stat_col1:
-        st.metric("Текущий спред", f"{stats['current']:.2f} б.п.")
-        st.metric("Среднее", f"{stats['mean']:.2f} б.п.")
-    with stat_col2:
-        st.metric("P10", f"{stats['p10']:.2f} б.п.")
-        st.metric("P25", f"{stats['p25']:.2f} б.п.")
-    with stat_col3:
-        st.metric("P75", f"{stats['p75']:.2f} б.п.")
-        st.metric("P90", f"{stats['p90']:.2f} б.п.")
-    with stat_col4:
-        st.metric("Минимум", f"{stats['min']:.2f} б.п.")
-        st.metric("Максимум", f"{stats['max']:.2f} б.п.")
+    st.markdown(spread_stats_html(stats), unsafe_allow_html=True)
     
     # ==========================================
     # ИСТОРИЯ ДАННЫХ
@@ -4,30 +4,28 @@
 Модальное окно для выбора избранных облигаций (версия 0.2.0)
 """
 import streamlit as st
-import pandas as pd
 import requests
 from datetime import datetime, date, timedelta
 from typing import List, Dict, Any, Optional
 import logging
 
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.database import get_db
+from api.moex_bonds import MOEXBondsFetcher, filter_ofz_for_trading
+
 logger = logging.getLogger(__name__)
 
 
 def get_bond_manager():
     """Получить менеджер БД"""
-    import sys
-    import os
-    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from core.database import get_db
     return get_db()
 
 
 def get_moex_fetcher():
     """Получить fetcher для MOEX"""
-    import sys
-    import os
-    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from api.moex_bonds import MOEXBondsFetcher
     return MOEXBondsFetcher()
 
 
@@ -52,7 +50,6 @@ def load_bonds_for_display() -> List[Dict[str, Any]]:
             all_bonds = fetcher.fetch_ofz_with_market_data(include_details=False)
 
             # Фильтруем
-            from api.moex_bonds import filter_ofz_for_trading
             filtered_bonds = filter_ofz_for_trading(all_bonds)
 
             # Сохраняем в БД
@@ -122,6 +119,49 @@ def format_maturity(maturity_date: Optional[str]) -> str:
         return maturity_date
 
 
+# Поля облигации для сортировки в модальном окне
+SORT_FIELDS = {
+    "Дюрации": "duration_years",
+    "YTM": "last_ytm",
+    "Купону": "coupon_rate",
+    "Погашению": "maturity_date",
+    "Названию": "name",
+}
+
+
+def sort_bonds_for_display(bonds: List[Dict[str, Any]], sort_by: str = "Дюрации") -> List[Dict[str, Any]]:
+    """
+    Отсортировать облигации для модального окна
+
+    Сортировка по сырым значениям (пустые - в конце), затем избранные
+    поднимаются наверх разбиением за один проход с сохранением порядка.
+
+    Args:
+        bonds: Список облигаций из БД
+        sort_by: Ключ из SORT_FIELDS
+
+    Returns:
+        Новый отсортированный список
+    """
+    field = SORT_FIELDS.get(sort_by, "duration_years")
+
+    if field == "name":
+        def sort_key(b):
+            return (0, b.get("name") or b.get("short_name") or "")
+    else:
+        def sort_key(b):
+            value = b.get(field)
+            return (1, 0) if value is None else (0, value)
+
+    ordered = sorted(bonds, key=sort_key)
+
+    favorites, rest = [], []
+    for b in ordered:
+        (favorites if b.get("is_favorite") else rest).append(b)
+    favorites.extend(rest)
+    return favorites
+
+
 @st.dialog("Управление облигациями", width="large")
 def show_bond_manager_dialog():
     """
@@ -188,7 +228,6 @@ def show_bond_manager_dialog():
                 status_placeholder.info(f"Получено {len(all_bonds)} облигаций")
                 
                 # Фильтруем
-                from api.moex_bonds import filter_ofz_for_trading
                 filtered_bonds = filter_ofz_for_trading(all_bonds)
                 
                 if not filtered_bonds:
@@ -257,40 +296,29 @@ def show_bond_manager_dialog():
         st.warning("Нет облигаций в базе данных. Нажмите 'Обновить с MOEX'")
         return
 
-    # Создаём DataFrame для отображения
-    df_data = []
-    for b in bonds:
-        df_data.append({
-            "ISIN": b.get("isin"),
-            "Название": b.get("name") or b.get("short_name"),
-            "Купон": format_coupon(b.get("coupon_rate")),
-            "Погашение": format_maturity(b.get("maturity_date")),
-            "Дюрация": format_duration(b.get("duration_years")),
-            "YTM": format_ytm(b.get("last_ytm")),
-            "⭐": "⭐" if b.get("is_favorite") else "☆",
-            "is_favorite": b.get("is_favorite"),
-            "duration_years_raw": b.get("duration_years") or 0,
-        })
-
-    df = pd.DataFrame(df_data)
-
     # Сортировка
     sort_col = st.selectbox(
         "Сортировать по",
-        ["Дюрации", "YTM", "Купону", "Погашению", "Названию"],
+        list(SORT_FIELDS),
         index=0
     )
 
-    sort_map = {
-        "Дюрации": "duration_years_raw",
-        "YTM": "YTM",
-        "Купону": "Купон",
-        "Погашению": "Погашение",
-        "Названию": "Название",
-    }
+    bonds = sort_bonds_for_display(bonds, sort_col)
 
-    ascending = True
-    df = df.sort_values(by=sort_map[sort_col], ascending=ascending)
+    # Строки для отображения (без промежуточного DataFrame - таблица
+    # рисуется через st.columns, pandas здесь только добавлял конвертацию)
+    rows = [
+        {
+            "ISIN": b.get("isin"),
+            "Название": b.get("name") or b.get("short_name"),
+            "Купон": format_coupon(b.get("coupon_rate")),
+            "Погашение": format_maturity(b.get("maturity_date")),
+            "Дюрация": format_duration(b.get("duration_years")),
+            "YTM": format_ytm(b.get("last_ytm")),
+            "is_favorite": b.get("is_favorite"),
+        }
+        for b in bonds
+    ]
 
     # Отображаем таблицу
     # Используем columns для заголовка
@@ -316,7 +344,7 @@ def show_bond_manager_dialog():
     st.divider()
 
     # Отображаем облигации
-    for idx, row in df.iterrows():
+    for row in rows:
         col1, col2, col3, col4, col5, col6, col7 = st.columns(
             [3, 2, 1, 2, 1, 1, 0.5]
         )
@@ -360,7 +388,7 @@ def show_bond_manager_dialog():
         st.divider()
 
     # Итого
-    st.markdown(f"**Всего облигаций:** {len(df)}")
+    st.markdown(f"**Всего облигаций:** {len(rows)}")
 
 
 def render_bond_manager_button():
@@ -4,10 +4,12 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, date
-from typing import Optional, Dict, List, Any, Tuple
+from functools import lru_cache
+from typing import Optional, Dict, List, Any, Tuple, Union
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import plotly.express as px
+import streamlit as st
 import logging
 
 logger = logging.getLogger(__name__)
@@ -43,6 +45,400 @@ SIGNAL_COLORS = {
     "NO_DATA": "#808080"
 }
 
+# Общие параметры оформления (Plotly копирует их в update_layout)
+CHART_MARGIN = dict(l=60, r=30, t=80, b=60)
+SIGNAL_MARGIN = dict(l=60, r=30, t=60, b=60)
+COMPACT_MARGIN = dict(l=0, r=0, t=40, b=0)
+
+# Горизонтальная легенда над графиком
+CHART_LEGEND = dict(
+    orientation="h",
+    yanchor="bottom",
+    y=1.02,
+    xanchor="right",
+    x=1
+)
+YTM_LEGEND = dict(CHART_LEGEND, font=dict(size=10))
+
+# Шаблоны подсказок при наведении
+YTM_HOVER = '%{y:.2f}%<extra></extra>'
+SPREAD_HOVER = 'Спред: %{y:.1f} б.п.<extra></extra>'
+
+
+@lru_cache(maxsize=64)
+def _spread_hover(name: str) -> str:
+    """Шаблон подсказки для спреда пары (строится один раз на имя)"""
+    return f'{name}: %{{y:.1f}} б.п.<extra></extra>'
+
+
+# Колонки внутридневных данных
+INTRADAY_COLUMNS = ["time", "spread_bp", "ytm_long", "ytm_short"]
+
+# Максимум точек в линии графика (порядка ширины графика в пикселях)
+MAX_CHART_POINTS = 2000
+
+# Заливка под линией: для рядов длиннее порога - отдельный трейс
+# с меньшим числом точек
+FILL_THRESHOLD = MAX_CHART_POINTS
+FILL_MAX_POINTS = 500
+
+# Начиная с этого числа точек на графике линии рисуются через WebGL:
+# SVG в браузере заметно тормозит при панорамировании и масштабировании
+WEBGL_THRESHOLD = 5_000
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Индексы точек, отобранных алгоритмом LTTB (Largest-Triangle-Three-Buckets)
+
+    Первая и последняя точки сохраняются всегда, из каждой внутренней корзины
+    берётся точка с наибольшей площадью треугольника с соседями - форма
+    линии (пики и провалы) сохраняется.
+
+    Args:
+        x: Числовые координаты X (монотонные)
+        y: Значения Y
+        n_out: Сколько точек оставить
+
+    Returns:
+        Отсортированный массив индексов
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    every = (n - 2) / (n_out - 2)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    a = 0
+
+    for i in range(n_out - 2):
+        # Средняя точка следующей корзины
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, n)
+        if avg_start >= avg_end:
+            avg_x, avg_y = x[-1], y[-1]
+        else:
+            avg_x = x[avg_start:avg_end].mean()
+            segment = y[avg_start:avg_end]
+            segment = segment[~np.isnan(segment)]
+            avg_y = segment.mean() if segment.size else y[a]
+
+        # Текущая корзина
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        # NaN не должны выигрывать у реальных точек
+        area = np.where(np.isnan(area), -1.0, area)
+
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+
+    return indices
+
+
+def _datetime_index(x: Any) -> Optional[pd.DatetimeIndex]:
+    """
+    Ось X как DatetimeIndex (таймзона сохраняется) или None, если это не даты
+
+    Кроме datetime64 распознаются tz-aware индексы и object-массивы
+    с datetime.date/datetime/Timestamp.
+    """
+    index = x if isinstance(x, pd.Index) else pd.Index(x)
+    if isinstance(index, pd.DatetimeIndex):
+        return index
+    if index.dtype != object or pd.api.types.infer_dtype(index, skipna=True) not in (
+        "datetime", "datetime64", "date"
+    ):
+        return None
+    try:
+        return pd.DatetimeIndex(pd.to_datetime(index))
+    except (TypeError, ValueError):
+        # Смешанные таймзоны приводятся к UTC
+        try:
+            return pd.DatetimeIndex(pd.to_datetime(index, utc=True))
+        except (TypeError, ValueError):
+            return None
+
+
+def _lttb_x(x: Any, x_arr: np.ndarray) -> np.ndarray:
+    """
+    Числовые координаты X для разбиения на корзины LTTB
+
+    Даты - целые от эпохи (tz-aware приводятся к UTC). Если X не числа
+    и не даты, корзины строятся по номеру точки.
+    """
+    if np.issubdtype(x_arr.dtype, np.datetime64):
+        # Сырые int64 без копии: для LTTB единица времени (ns/us/s) не важна,
+        # площади треугольников масштабируются одинаково
+        return x_arr.view(np.int64)
+    if np.issubdtype(x_arr.dtype, np.number):
+        return x_arr
+
+    dates = _datetime_index(x)
+    if dates is None:
+        return np.arange(len(x_arr))
+    if dates.tz is not None:
+        dates = dates.tz_convert(None)
+    return dates.asi8
+
+
+def downsample_xy(x, y, max_points: int = MAX_CHART_POINTS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Прорядить линию для отрисовки
+
+    Короткие ряды возвращаются без изменений (как массивы numpy).
+    Значения X на выходе - исходные (даты не пересчитываются в числа).
+
+    Args:
+        x: Ось X (DatetimeIndex, в том числе tz-aware, Series дат или чисел)
+        y: Значения Y
+        max_points: Максимум точек на выходе
+
+    Returns:
+        (x, y) после прореживания
+    """
+    x_arr = np.asarray(x)
+    y_arr = np.asarray(y, dtype=np.float64)
+
+    if len(y_arr) <= max_points:
+        return x_arr, y_arr
+
+    idx = lttb_indices(_lttb_x(x, x_arr), y_arr, max_points)
+    return x_arr[idx], y_arr[idx]
+
+
+def axis_values(index: Any) -> Tuple[np.ndarray, Optional[str]]:
+    """
+    Значения общей оси X для всех трейсов графика и тип оси
+
+    Даты передаются числами - миллисекундами от эпохи (float64): Plotly
+    сериализует такой массив в двоичном виде, а не ISO-строкой на каждую
+    точку каждого трейса. Тип оси "date" тогда задаётся явно.
+
+    tz-aware индексы и object-массивы дат приводятся к тому же виду;
+    для tz-aware берётся местное время (Plotly и раньше отбрасывал смещение).
+
+    Args:
+        index: Индекс DataFrame/Series
+
+    Returns:
+        (значения, тип оси или None)
+    """
+    values = np.asarray(index)
+    if not np.issubdtype(values.dtype, np.datetime64):
+        if values.dtype != object:
+            return values, None
+        dates = _datetime_index(index)
+        if dates is None:
+            return values, None
+        if dates.tz is not None:
+            dates = dates.tz_localize(None)
+        values = dates.to_numpy()
+    return values.astype("datetime64[ms]").astype(np.float64), "date"
+
+
+def line_trace_class(n_points: int) -> type:
+    """
+    Класс трейса для линий графика
+
+    Небольшие графики остаются в SVG (go.Scatter) с точным оформлением,
+    большие переходят на WebGL (go.Scattergl).
+
+    Args:
+        n_points: Сколько точек будет отрисовано во всех линиях
+
+    Returns:
+        go.Scatter или go.Scattergl
+    """
+    return go.Scattergl if n_points > WEBGL_THRESHOLD else go.Scatter
+
+
+def display_values(y: np.ndarray) -> np.ndarray:
+    """
+    Значения линии для передачи в браузер
+
+    Plotly сериализует массивы numpy в двоичном виде: float32 вдвое меньше
+    float64, а 7 значащих цифр с запасом хватает для YTM (0.01%) и спредов
+    (0.1 б.п.). Только для трейсов с форматированной подсказкой.
+    """
+    return np.asarray(y, dtype=np.float32)
+
+
+# Привязка подписи горизонтальной линии (как annotation_position у add_hline)
+HLINE_ANNOTATION_POSITIONS = {
+    "top right": dict(x=1, xanchor="right", yanchor="bottom"),
+    "right": dict(x=1, xanchor="left", yanchor="middle"),
+    "left": dict(x=0, xanchor="right", yanchor="middle"),
+    "inside left": dict(x=0, xanchor="left", yanchor="middle"),
+}
+
+
+def hline_shape(y: float, color: str, dash: str) -> Dict[str, Any]:
+    """
+    Горизонтальная линия на всю ширину графика (shape для layout)
+
+    Args:
+        y: Уровень
+        color: Цвет линии
+        dash: Стиль линии
+
+    Returns:
+        Словарь shape
+    """
+    return dict(
+        type="line", xref="x domain", yref="y",
+        x0=0, x1=1, y0=y, y1=y,
+        line=dict(color=color, dash=dash)
+    )
+
+
+def hline_layout(
+    lines: List[Tuple[float, str, str, str, str]]
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Горизонтальные линии с подписями в виде готовых shapes/annotations
+
+    Вместо нескольких fig.add_hline (каждый вызов - отдельная валидация
+    и пересборка layout) результат передаётся в один fig.update_layout.
+
+    Args:
+        lines: Список (y, подпись, цвет, стиль линии, позиция подписи)
+
+    Returns:
+        (shapes, annotations)
+    """
+    shapes = []
+    annotations = []
+    for y, text, color, dash, position in lines:
+        shapes.append(hline_shape(y, color, dash))
+        annotations.append(level_annotation(y, text, position))
+    return shapes, annotations
+
+
+def level_annotation(y: float, text: str, position: str = "top right") -> Dict[str, Any]:
+    """
+    Подпись уровня по оси Y на всю ширину графика
+
+    Args:
+        y: Уровень
+        text: Текст подписи
+        position: Ключ HLINE_ANNOTATION_POSITIONS
+
+    Returns:
+        Словарь annotation для layout
+    """
+    return dict(
+        text=text, showarrow=False,
+        xref="x domain", yref="y", y=y,
+        **HLINE_ANNOTATION_POSITIONS[position]
+    )
+
+
+def band_shapes(bands: List[Tuple[float, float, str]]) -> List[Dict[str, Any]]:
+    """
+    Горизонтальные полосы (прямоугольники на всю ширину) под графиком
+
+    Args:
+        bands: Список (нижняя граница, верхняя граница, цвет заливки)
+
+    Returns:
+        Список shapes для layout
+    """
+    return [
+        dict(
+            type="rect", xref="x domain", yref="y",
+            x0=0, x1=1, y0=y0, y1=y1,
+            fillcolor=fillcolor, line_width=0, layer="below"
+        )
+        for y0, y1, fillcolor in bands
+    ]
+
+
+def intraday_to_frame(intraday_data: Union[List[Any], pd.DataFrame]) -> pd.DataFrame:
+    """
+    Привести внутридневные данные к DataFrame
+    
+    Список IntradayPoint разбирается за один проход в словарь списков,
+    DataFrame возвращается как есть.
+    
+    Args:
+        intraday_data: Список IntradayPoint или DataFrame
+        
+    Returns:
+        DataFrame с колонками INTRADAY_COLUMNS
+    """
+    if isinstance(intraday_data, pd.DataFrame):
+        return intraday_data
+    
+    columns: Dict[str, List[Any]] = {col: [] for col in INTRADAY_COLUMNS}
+    for p in intraday_data:
+        columns["time"].append(p.time)
+        columns["spread_bp"].append(p.spread_bp)
+        columns["ytm_long"].append(p.ytm_long)
+        columns["ytm_short"].append(p.ytm_short)
+    
+    return pd.DataFrame(columns)
+
+
+# Поля bonds_info, попадающие в легенду графика YTM
+LEGEND_FIELDS = ["years_to_maturity", "current_ytm", "duration_years"]
+
+
+@lru_cache(maxsize=1024)
+def _format_bond_legend(
+    name: str,
+    years: Optional[float],
+    ytm: Optional[float],
+    duration: Optional[float]
+) -> str:
+    """
+    Сформировать подпись легенды для одной облигации
+    
+    Кэшируется по скалярным значениям: при перезапусках скрипта Streamlit
+    bonds_info почти не меняется, и строки не форматируются заново.
+    """
+    # Формат: "ОФЗ 26238 | 15.2г. | YTM: 7.50% | D: 12.3"
+    parts = [name]
+    if years:
+        parts.append(f"{years:.1f}г.")
+    if ytm:
+        parts.append(f"YTM: {ytm:.2f}%")
+    if duration:
+        parts.append(f"D: {duration:.1f}")
+    return " | ".join(parts)
+
+
+def _legend_value(info: Dict[str, Any], field: str) -> Optional[float]:
+    """Значение поля для ключа кэша: пропуски (None/NaN) приводятся к None"""
+    value = info.get(field)
+    return None if value is None or pd.isna(value) else value
+
+
+def _legend_names(columns: pd.Index, bonds_info: Optional[Dict[str, Any]]) -> List[str]:
+    """Подписи легенды для всех колонок графика YTM"""
+    if not bonds_info:
+        return [str(col) for col in columns]
+    
+    names = []
+    for col in columns:
+        info = bonds_info.get(col)
+        if info is None:
+            names.append(str(col))
+        else:
+            names.append(_format_bond_legend(
+                str(col), *(_legend_value(info, field) for field in LEGEND_FIELDS)
+            ))
+    return names
+
 
 class ChartBuilder:
     """Построитель графиков"""
@@ -60,7 +456,8 @@ class ChartBuilder:
         self,
         ytm_data: pd.DataFrame,
         bonds_info: Optional[Dict[str, Any]] = None,
-        title: str = "Доходность к погашению (YTM)"
+        title: str = "Доходность к погашению (YTM)",
+        max_points: int = MAX_CHART_POINTS
     ) -> go.Figure:
         """
         Создать график YTM
@@ -69,63 +466,61 @@ class ChartBuilder:
             ytm_data: DataFrame с YTM (columns = bond names)
             bonds_info: Информация по облигациям
             title: Заголовок
+            max_points: Максимум точек в линии (длинные ряды прореживаются LTTB)
             
         Returns:
             Plotly Figure
         """
-        fig = go.Figure()
+        names = _legend_names(ytm_data.columns, bonds_info)
+        
+        # Ось X конвертируется один раз и общая для всех облигаций
+        x_vals, xaxis_type = axis_values(ytm_data.index)
+        scatter = line_trace_class(ytm_data.shape[1] * min(len(ytm_data), max_points))
         
-        for i, col in enumerate(ytm_data.columns):
+        traces = []
+        for i, (col, name) in enumerate(zip(ytm_data.columns, names)):
             color = BOND_COLORS[i % len(BOND_COLORS)]
+            x, y = downsample_xy(x_vals, ytm_data[col].to_numpy(copy=False), max_points)
             
-            # Формируем имя для легенды
-            name = col
-            if bonds_info and col in bonds_info:
-                info = bonds_info[col]
-                # Формат: "ОФЗ 26238 (15.2г., YTM: 7.5%, D: 12.3)"
-                parts = [col]
-                if info.get("years_to_maturity"):
-                    parts.append(f"{info['years_to_maturity']:.1f}г.")
-                if info.get("current_ytm"):
-                    parts.append(f"YTM: {info['current_ytm']:.2f}%")
-                if info.get("duration_years"):
-                    parts.append(f"D: {info['duration_years']:.1f}")
-                name = " | ".join(parts)
-            
-            fig.add_trace(go.Scatter(
-                x=ytm_data.index,
-                y=ytm_data[col],
+            traces.append(scatter(
+                x=x,
+                y=display_values(y),
                 mode='lines',
                 name=name,
                 line=dict(color=color, width=1.5),
-                hovertemplate=f'%{{y:.2f}}%<extra></extra>'
+                hovertemplate=YTM_HOVER,
+                _validate=False
             ))
         
+        # Трейсы создаются без валидации каждого свойства (_validate=False):
+        # параметры заведомо корректны. Layout по-прежнему валидируется -
+        # иначе имя темы не раскрывается в шаблон
+        fig = go.Figure(data=traces)
+        
         fig.update_layout(
             title=title,
             xaxis_title="Дата",
+            xaxis_type=xaxis_type,
             yaxis_title="YTM (%)",
             hovermode='x unified',
             template=self.theme,
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1,
-                font=dict(size=10)
-            ),
+            legend=YTM_LEGEND,
             height=500,
-            margin=dict(l=60, r=30, t=80, b=60)
+            margin=CHART_MARGIN
         )
         
-        # Добавляем диапазон Y
-        ytm_values = ytm_data.values.flatten()
-        ytm_values = ytm_values[~np.isnan(ytm_values)]
-        if len(ytm_values) > 0:
-            y_min, y_max = ytm_values.min(), ytm_values.max()
+        # Добавляем диапазон Y: один проход по 2-D массиву без временных копий.
+        # fmin/fmax пропускают NaN и, в отличие от nanmin, молча дают NaN
+        # для полностью пустых данных
+        vals = ytm_data.to_numpy(dtype=np.float64, copy=False)
+        if vals.size:
+            y_min = np.fmin.reduce(vals, axis=None)
+            y_max = np.fmax.reduce(vals, axis=None)
+        else:
+            y_min = y_max = np.nan
+        if np.isfinite(y_min):
             padding = (y_max - y_min) * 0.1
-            fig.update_yaxes(range=[y_min - padding, y_max + padding])
+            fig.update_layout(yaxis_range=[y_min - padding, y_max + padding])
         
         return fig
     
@@ -134,7 +529,8 @@ class ChartBuilder:
         spread_data: pd.DataFrame,
         spread_stats: Optional[Dict[str, Any]] = None,
         show_percentiles: bool = True,
-        title: str = "Спреды доходности"
+        title: str = "Спреды доходности",
+        max_points: int = MAX_CHART_POINTS
     ) -> go.Figure:
         """
         Создать график спредов
@@ -144,74 +540,66 @@ class ChartBuilder:
             spread_stats: Статистика спредов
             show_percentiles: Показывать перцентили
             title: Заголовок
+            max_points: Максимум точек в линии (длинные ряды прореживаются LTTB)
             
         Returns:
             Plotly Figure
         """
-        fig = go.Figure()
-        
         # Цвета для разных пар
         colors = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728"]
         
+        x_vals, xaxis_type = axis_values(spread_data.index)
+        scatter = line_trace_class(spread_data.shape[1] * min(len(spread_data), max_points))
+        
+        traces = []
         for i, col in enumerate(spread_data.columns):
             color = colors[i % len(colors)]
+            x, y = downsample_xy(x_vals, spread_data[col].to_numpy(copy=False), max_points)
             
-            fig.add_trace(go.Scatter(
-                x=spread_data.index,
-                y=spread_data[col],
+            traces.append(scatter(
+                x=x,
+                y=display_values(y),
                 mode='lines',
                 name=col,
                 line=dict(color=color, width=1.5),
-                hovertemplate=f'{col}: %{{y:.1f}} б.п.<extra></extra>'
+                hovertemplate=_spread_hover(str(col)),
+                _validate=False
             ))
         
-        # Добавляем перцентили для первой пары если есть
+        fig = go.Figure(data=traces)
+        
+        # Перцентили для первой пары если есть (одним обновлением layout)
+        shapes, annotations = [], []
         if show_percentiles and spread_stats:
             first_pair = list(spread_stats.keys())[0]
             stats = spread_stats[first_pair]
             
-            # P10 (нижняя граница)
-            fig.add_hline(
-                y=stats.percentile_10,
-                line_dash="dash",
-                line_color="green",
-                annotation_text=f"P10 ({stats.percentile_10:.0f})",
-                annotation_position="right"
-            )
-            
-            # P90 (верхняя граница)
-            fig.add_hline(
-                y=stats.percentile_90,
-                line_dash="dash",
-                line_color="red",
-                annotation_text=f"P90 ({stats.percentile_90:.0f})",
-                annotation_position="right"
-            )
-            
-            # Среднее
-            fig.add_hline(
-                y=stats.mean,
-                line_dash="dot",
-                line_color="gray",
-                annotation_text=f"Mean ({stats.mean:.0f})",
-                annotation_position="left"
-            )
+            # Полосы P10-P90 и P25-P75, линия среднего
+            shapes, annotations = hline_layout([
+                (stats.mean, f"Mean ({stats.mean:.0f})", "gray", "dot", "left"),
+            ])
+            shapes = band_shapes([
+                (stats.percentile_10, stats.percentile_90, "rgba(128, 128, 128, 0.06)"),
+                (stats.percentile_25, stats.percentile_75, "rgba(128, 128, 128, 0.12)"),
+            ]) + shapes
+            annotations += [
+                # Подписи только на границах внешней полосы
+                level_annotation(stats.percentile_10, f"P10 ({stats.percentile_10:.0f})", "right"),
+                level_annotation(stats.percentile_90, f"P90 ({stats.percentile_90:.0f})", "right"),
+            ]
         
         fig.update_layout(
             title=title,
             xaxis_title="Дата",
+            xaxis_type=xaxis_type,
             yaxis_title="Спред (б.п.)",
             hovermode='x unified',
             template=self.theme,
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1
-            ),
+            legend=CHART_LEGEND,
             height=500,
-            margin=dict(l=60, r=30, t=80, b=60)
+            margin=CHART_MARGIN,
+            shapes=shapes,
+            annotations=annotations
         )
         
         return fig
@@ -220,7 +608,8 @@ class ChartBuilder:
         self,
         spread_series: pd.Series,
         signals: List[Any],
-        title: str = "Сигналы на спреде"
+        title: str = "Сигналы на спреде",
+        max_points: int = MAX_CHART_POINTS
     ) -> go.Figure:
         """
         Создать график сигналов
@@ -229,87 +618,87 @@ class ChartBuilder:
             spread_series: Series со спредом
             signals: Список сигналов
             title: Заголовок
+            max_points: Максимум точек в линии (длинные ряды прореживаются LTTB)
             
         Returns:
             Plotly Figure
         """
-        fig = go.Figure()
-        
-        # График спреда
-        fig.add_trace(go.Scatter(
-            x=spread_series.index,
-            y=spread_series,
-            mode='lines',
-            name='Спред',
-            line=dict(color="#1f77b4", width=1.5),
-            hovertemplate='Спред: %{y:.1f} б.п.<extra></extra>'
-        ))
-        
-        # Перцентили
-        lookback = min(252, len(spread_series))
-        spread_window = spread_series.tail(lookback)
-        
-        p10 = spread_window.quantile(0.1)
-        p25 = spread_window.quantile(0.25)
-        p75 = spread_window.quantile(0.75)
-        p90 = spread_window.quantile(0.9)
-        
-        # Зоны
-        # Зона покупки (ниже P25)
-        fig.add_hrect(
-            y0=spread_window.min() - 5,
-            y1=p25,
-            fillcolor="green",
-            opacity=0.1,
-            line_width=0,
-            annotation_text="Покупка",
-            annotation_position="inside left"
-        )
-        
-        # Зона продажи (выше P75)
-        fig.add_hrect(
-            y0=p75,
-            y1=spread_window.max() + 5,
-            fillcolor="red",
-            opacity=0.1,
-            line_width=0,
-            annotation_text="Продажа",
-            annotation_position="inside left"
-        )
-        
-        # Линии перцентилей
-        for pct, val, color in [(p10, "P10", "darkgreen"), (p90, "P90", "darkred")]:
-            fig.add_hline(
-                y=val,
-                line_dash="dash",
-                line_color=color,
-                opacity=0.7,
-                annotation_text=f"{pct}={val:.0f}",
-                annotation_position="right"
-            )
-        
-        # Текущее значение
-        current = spread_series.iloc[-1]
-        fig.add_trace(go.Scatter(
-            x=[spread_series.index[-1]],
-            y=[current],
-            mode='markers',
-            marker=dict(size=12, color='red', symbol='diamond'),
-            name=f'Текущий: {current:.1f}',
-            showlegend=True
-        ))
-        
-        fig.update_layout(
+        layout = dict(
             title=title,
             xaxis_title="Дата",
             yaxis_title="Спред (б.п.)",
             hovermode='x unified',
             template=self.theme,
             height=500,
-            margin=dict(l=60, r=30, t=60, b=60)
+            margin=SIGNAL_MARGIN
         )
         
-        return fig
+        # Нет данных - только оформление, без перцентилей и текущей точки
+        if spread_series.empty:
+            return go.Figure(layout=layout)
+        
+        # Перцентили
+        lookback = min(252, len(spread_series))
+        window_values = spread_series.tail(lookback).to_numpy(dtype=np.float64)
+        window_values = window_values[~np.isnan(window_values)]
+        
+        # Зоны и линии перцентилей - готовыми shapes/annotations в layout
+        # (вместо add_hrect/add_hline с отдельной валидацией на каждый вызов)
+        shapes, annotations = [], []
+        if window_values.size:
+            # Все перцентили одной сортировкой окна (без NaN-версии квантилей)
+            p10, p25, p75, p90 = np.quantile(window_values, [0.1, 0.25, 0.75, 0.9])
+            
+            # Зона покупки (ниже P25) и зона продажи (выше P75)
+            zones = [
+                (window_values.min() - 5, p25, "green", "Покупка"),
+                (p75, window_values.max() + 5, "red", "Продажа"),
+            ]
+            for y0, y1, color, text in zones:
+                shapes.append(dict(
+                    type="rect", xref="x domain", yref="y",
+                    x0=0, x1=1, y0=y0, y1=y1,
+                    fillcolor=color, opacity=0.1, line_width=0
+                ))
+                annotations.append(level_annotation((y0 + y1) / 2, text, "inside left"))
+            
+            # Линии перцентилей
+            for label, val, color in [("P10", p10, "darkgreen"), ("P90", p90, "darkred")]:
+                shapes.append(dict(
+                    type="line", xref="x domain", yref="y",
+                    x0=0, x1=1, y0=val, y1=val,
+                    line=dict(color=color, dash="dash"), opacity=0.7
+                ))
+                annotations.append(level_annotation(val, f"{label}={val:.0f}", "right"))
+        
+        # График спреда (перцентили выше считаются по полному ряду)
+        # и текущее значение - трейсы без валидации свойств, layout одним словарём
+        x_vals, xaxis_type = axis_values(spread_series.index)
+        x, y = downsample_xy(x_vals, spread_series.to_numpy(copy=False), max_points)
+        current = spread_series.iloc[-1]
+        return go.Figure(
+            data=[
+                go.Scatter(
+                    x=x,
+                    y=display_values(y),
+                    mode='lines',
+                    name='Спред',
+                    line=dict(color="#1f77b4", width=1.5),
+                    hovertemplate=SPREAD_HOVER,
+                    _validate=False
+                ),
+                go.Scatter(
+                    x=[x_vals[-1]],
+                    y=[current],
+                    mode='markers',
+                    marker=dict(size=12, color='red', symbol='diamond'),
+                    name=f'Текущий: {current:.1f}',
+                    showlegend=True,
+                    _validate=False
+                ),
+            ],
+            layout=dict(layout, xaxis_type=xaxis_type, shapes=shapes, annotations=annotations)
+        )
     
     def create_backtest_chart(
         self,
@@ -342,48 +731,49 @@ class ChartBuilder:
             horizontal_spacing=0.1
         )
         
-        # 1. Кривая капитала
+        # Трейсы и их ячейки сетки собираются в списки и добавляются одним вызовом
+        traces, rows, cols = [], [], []
+        
+        # 1. Кривая капитала (массивом numpy - двоичная сериализация вместо текста)
         if backtest_result.equity_curve:
-            fig.add_trace(
-                go.Scatter(
-                    y=backtest_result.equity_curve,
-                    mode='lines',
-                    name='Капитал',
-                    line=dict(color='#1f77b4', width=2)
-                ),
-                row=1, col=1
-            )
+            traces.append(go.Scatter(
+                y=np.asarray(backtest_result.equity_curve, dtype=np.float64),
+                mode='lines',
+                name='Капитал',
+                line=dict(color='#1f77b4', width=2)
+            ))
+            rows.append(1)
+            cols.append(1)
         
-        # 2. Распределение P&L
-        pnl_values = [p.pnl_bp for p in backtest_result.positions]
-        if pnl_values:
-            colors = ['green' if x > 0 else 'red' for x in pnl_values]
-            fig.add_trace(
-                go.Histogram(
-                    x=pnl_values,
-                    nbinsx=20,
-                    name='P&L',
-                    marker_color='#1f77b4',
-                    opacity=0.7
-                ),
-                row=1, col=2
-            )
+        # P&L по сделкам (один проход по позициям)
+        positions = backtest_result.positions
+        pnl = np.fromiter(
+            (p.pnl_bp for p in positions), dtype=np.float64, count=len(positions)
+        )
         
-        # 3. P&L по сделкам
-        if backtest_result.positions:
-            trade_numbers = list(range(1, len(backtest_result.positions) + 1))
-            pnl_by_trade = [p.pnl_bp for p in backtest_result.positions]
-            colors = ['green' if x > 0 else 'red' for x in pnl_by_trade]
+        if pnl.size:
+            # 2. Распределение P&L
+            traces.append(go.Histogram(
+                x=pnl,
+                nbinsx=20,
+                name='P&L',
+                marker_color='#1f77b4',
+                opacity=0.7
+            ))
+            rows.append(1)
+            cols.append(2)
             
-            fig.add_trace(
-                go.Bar(
-                    x=trade_numbers,
-                    y=pnl_by_trade,
-                    marker_color=colors,
-                    name='P&L'
-                ),
-                row=2, col=1
-            )
+            # 3. P&L по сделкам
+            colors = np.where(pnl > 0, 'green', 'red')
+            
+            traces.append(go.Bar(
+                x=np.arange(1, pnl.size + 1),
+                y=pnl,
+                marker_color=colors.tolist(),
+                name='P&L'
+            ))
+            rows.append(2)
+            cols.append(1)
         
         # 4. Метрики
         metrics = [
@@ -397,52 +787,57 @@ class ChartBuilder:
             ["Avg Hold (дней)", f"{backtest_result.avg_holding_days:.1f}"]
         ]
         
-        fig.add_trace(
-            go.Table(
-                header=dict(
-                    values=metrics[0],
-                    fill_color='#f8f9fa',
-                    align='left',
-                    font=dict(size=12, weight='bold')
-                ),
-                cells=dict(
-                    values=list(zip(*metrics[1:])),
-                    fill_color='white',
-                    align='left',
-                    font=dict(size=11)
-                )
+        traces.append(go.Table(
+            header=dict(
+                values=metrics[0],
+                fill_color='#f8f9fa',
+                align='left',
+                font=dict(size=12, weight='bold')
             ),
-            row=2, col=2
-        )
+            cells=dict(
+                values=list(zip(*metrics[1:])),
+                fill_color='white',
+                align='left',
+                font=dict(size=11)
+            )
+        ))
+        rows.append(2)
+        cols.append(2)
         
+        fig.add_traces(traces, rows=rows, cols=cols)
+        
+        # Подписи осей задаются в том же обновлении layout:
+        # xaxis/yaxis - капитал, xaxis2/yaxis2 - гистограмма, xaxis3/yaxis3 - сделки
         fig.update_layout(
             title=title,
             template=self.theme,
             height=700,
-            showlegend=False
+            showlegend=False,
+            yaxis_title_text="Капитал",
+            xaxis2_title_text="P&L (б.п.)",
+            yaxis2_title_text="Частота",
+            xaxis3_title_text="Номер сделки",
+            yaxis3_title_text="P&L (б.п.)"
         )
         
-        fig.update_xaxes(title_text="Номер сделки", row=2, col=1)
-        fig.update_yaxes(title_text="P&L (б.п.)", row=2, col=1)
-        fig.update_yaxes(title_text="Капитал", row=1, col=1)
-        fig.update_xaxes(title_text="P&L (б.п.)", row=1, col=2)
-        fig.update_yaxes(title_text="Частота", row=1, col=2)
-        
         return fig
     
     def create_intraday_chart(
         self,
-        intraday_data: List[Any],
+        intraday_data: Union[List[Any], pd.DataFrame],
         pair_name: str,
-        title: Optional[str] = None
+        title: Optional[str] = None,
+        max_points: int = MAX_CHART_POINTS
     ) -> go.Figure:
         """
         Создать внутридневной график
         
         Args:
-            intraday_data: Список IntradayPoint
+            intraday_data: Список IntradayPoint или DataFrame с колонками
+                time, spread_bp, ytm_long, ytm_short
             pair_name: Название пары
             title: Заголовок
+            max_points: Максимум точек в каждой линии (прореживание LTTB)
             
         Returns:
             Plotly Figure
@@ -450,10 +845,13 @@ class ChartBuilder:
         if title is None:
             title = f"Внутридневной спред: {pair_name}"
         
-        times = [p.time for p in intraday_data]
-        spreads = [p.spread_bp for p in intraday_data]
-        ytm_long = [p.ytm_long for p in intraday_data]
-        ytm_short = [p.ytm_short for p in intraday_data]
+        df = intraday_to_frame(intraday_data)
+        times = df["time"].to_numpy()
+        
+        spread_x, spread_y = downsample_xy(times, df["spread_bp"].to_numpy(), max_points)
+        long_x, long_y = downsample_xy(times, df["ytm_long"].to_numpy(), max_points)
+        short_x, short_y = downsample_xy(times, df["ytm_short"].to_numpy(), max_points)
+        scatter = line_trace_class(len(spread_x) + len(long_x) + len(short_x))
         
         fig = make_subplots(
             rows=2, cols=1,
@@ -463,60 +861,53 @@ class ChartBuilder:
             row_heights=[0.6, 0.4]
         )
         
-        # Спред
-        fig.add_trace(
-            go.Scatter(
-                x=times,
-                y=spreads,
-                mode='lines+markers',
-                name='Спред',
-                line=dict(color='#1f77b4', width=2),
-                marker=dict(size=6)
-            ),
-            row=1, col=1
-        )
-        
-        # YTM
-        fig.add_trace(
-            go.Scatter(
-                x=times,
-                y=ytm_long,
-                mode='lines',
-                name='YTM Long',
-                line=dict(color='#2ca02c', width=1.5)
-            ),
-            row=2, col=1
-        )
-        
-        fig.add_trace(
-            go.Scatter(
-                x=times,
-                y=ytm_short,
-                mode='lines',
-                name='YTM Short',
-                line=dict(color='#d62728', width=1.5)
-            ),
-            row=2, col=1
+        # Трейсы создаются без валидации свойств и добавляются одним вызовом
+        fig.add_traces(
+            [
+                # Спред
+                scatter(
+                    x=spread_x,
+                    y=spread_y,
+                    mode='lines+markers',
+                    name='Спред',
+                    line=dict(color='#1f77b4', width=2),
+                    marker=dict(size=6),
+                    _validate=False
+                ),
+                # YTM
+                scatter(
+                    x=long_x,
+                    y=long_y,
+                    mode='lines',
+                    name='YTM Long',
+                    line=dict(color='#2ca02c', width=1.5),
+                    _validate=False
+                ),
+                scatter(
+                    x=short_x,
+                    y=short_y,
+                    mode='lines',
+                    name='YTM Short',
+                    line=dict(color='#d62728', width=1.5),
+                    _validate=False
+                ),
+            ],
+            rows=[1, 2, 2],
+            cols=[1, 1, 1]
         )
         
+        # Подписи осей - в том же обновлении layout (yaxis - спред, xaxis2/yaxis2 - YTM)
         fig.update_layout(
             title=title,
             template=self.theme,
             height=600,
             hovermode='x unified',
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1
-            )
+            legend=CHART_LEGEND,
+            yaxis_title_text="Спред (б.п.)",
+            xaxis2_title_text="Время",
+            yaxis2_title_text="YTM (%)"
         )
         
-        fig.update_yaxes(title_text="Спред (б.п.)", row=1, col=1)
-        fig.update_yaxes(title_text="YTM (%)", row=2, col=1)
-        fig.update_xaxes(title_text="Время", row=2, col=1)
-        
         return fig
     
     def create_exchange_status_card(
@@ -563,25 +954,45 @@ class ChartBuilder:
 
 
 # Удобные функции
+#
+# Результаты кэшируются через st.cache_data: при повторном запуске скрипта
+# с теми же данными фигура не строится заново.
+
+def _hash_pandas(obj: Any) -> Tuple:
+    """Стабильный хэш DataFrame/Series для st.cache_data"""
+    columns = tuple(obj.columns) if isinstance(obj, pd.DataFrame) else obj.name
+    return (
+        obj.shape,
+        columns,
+        pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes(),
+    )
+
+
+PANDAS_HASH_FUNCS = {pd.DataFrame: _hash_pandas, pd.Series: _hash_pandas}
+
+# Построитель по умолчанию для функций-обёрток (не создаётся на каждый вызов)
+_DEFAULT_BUILDER = ChartBuilder()
+
+
+@st.cache_data(ttl=300, show_spinner=False, hash_funcs=PANDAS_HASH_FUNCS)
 def create_ytm_chart(ytm_data: pd.DataFrame, **kwargs) -> go.Figure:
     """Создать график YTM"""
-    builder = ChartBuilder()
-    return builder.create_ytm_chart(ytm_data, **kwargs)
+    return _DEFAULT_BUILDER.create_ytm_chart(ytm_data, **kwargs)
 
 
+@st.cache_data(ttl=300, show_spinner=False, hash_funcs=PANDAS_HASH_FUNCS)
 def create_spread_chart(spread_data: pd.DataFrame, **kwargs) -> go.Figure:
     """Создать график спредов"""
-    builder = ChartBuilder()
-    return builder.create_spread_chart(spread_data, **kwargs)
+    return _DEFAULT_BUILDER.create_spread_chart(spread_data, **kwargs)
 
 
+@st.cache_data(ttl=300, show_spinner=False, hash_funcs=PANDAS_HASH_FUNCS)
 def create_signal_chart(spread_series: pd.Series, signals: List, **kwargs) -> go.Figure:
     """Создать график сигналов"""
-    builder = ChartBuilder()
-    return builder.create_signal_chart(spread_series, signals, **kwargs)
+    return _DEFAULT_BUILDER.create_signal_chart(spread_series, signals, **kwargs)
 
 
+@st.cache_data(ttl=300, show_spinner=False, hash_funcs=PANDAS_HASH_FUNCS)
 def create_backtest_chart(backtest_result: Any, **kwargs) -> go.Figure:
     """Создать график бэктеста"""
-    builder = ChartBuilder()
-    return builder.create_backtest_chart(backtest_result, **kwargs)
\ No newline at end of file
+    return _DEFAULT_BUILDER.create_backtest_chart(backtest_result, **kwargs)
\ No newline at end of file
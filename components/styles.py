@@ -0,0 +1,90 @@
+"""
+CSS стили приложения
+"""
+import re
+
+import streamlit as st
+
+
+CSS_STYLES = """
+<style>
+    .main-header {
+        font-size: 2.5rem;
+        font-weight: bold;
+        margin-bottom: 1rem;
+    }
+    .metric-card {
+        background: #f8f9fa;
+        padding: 15px;
+        border-radius: 10px;
+        border-left: 4px solid #1f77b4;
+    }
+    .stats-grid {
+        display: grid;
+        grid-template-columns: repeat(4, 1fr);
+        gap: 1rem;
+    }
+    .stats-grid .label {
+        color: #555;
+        font-size: 0.875rem;
+    }
+    .stats-grid .value {
+        color: #333;
+        font-size: 1.75rem;
+        margin-bottom: 0.5rem;
+    }
+    .signal-buy {
+        background: linear-gradient(135deg, #d4edda, #c3e6cb);
+        border-left: 4px solid #28a745;
+    }
+    .signal-sell {
+        background: linear-gradient(135deg, #f8d7da, #f5c6cb);
+        border-left: 4px solid #dc3545;
+    }
+    .signal-neutral {
+        background: linear-gradient(135deg, #fff3cd, #ffeeba);
+        border-left: 4px solid #ffc107;
+    }
+    .stMetric > div {
+        background: #f8f9fa;
+        padding: 10px;
+        border-radius: 8px;
+        color: #333;
+    }
+    .stMetric label {
+        color: #555 !important;
+    }
+    .stMetric [data-testid="stMetricValue"] {
+        color: #333 !important;
+    }
+    .mode-badge {
+        display: inline-block;
+        padding: 4px 12px;
+        border-radius: 15px;
+        font-size: 0.85em;
+        font-weight: bold;
+        margin-left: 10px;
+    }
+    .mode-daily {
+        background: #3498db;
+        color: white;
+    }
+    .mode-intraday {
+        background: #e74c3c;
+        color: white;
+    }
+</style>
+"""
+
+# Минифицируем один раз при импорте: меньше байт в браузер на каждом rerun
+MINIFIED_CSS = re.sub(r'\s+', ' ', CSS_STYLES).strip()
+
+
+def apply_styles():
+    """
+    Вставить CSS стили на страницу
+
+    Streamlit перестраивает страницу на каждом rerun, поэтому стили
+    нужно вставлять при каждом запуске скрипта.
+    """
+    st.markdown(MINIFIED_CSS, unsafe_allow_html=True)
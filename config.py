@@ -2,11 +2,12 @@
 Конфигурация OFZ Analytics Application
 """
 from dataclasses import dataclass, field
-from typing import Dict, List
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
 from datetime import time, date
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class BondConfig:
     """Конфигурация облигации"""
     isin: str
@@ -17,9 +18,18 @@ class BondConfig:
     coupon_frequency: int = 2  # Купоны в год (2 = полугодовые)
     issue_date: str = ""
     day_count_convention: str = "ACT/ACT"  # База расчёта дней
+    # Дата погашения, разобранная один раз при создании (None - неверная дата)
+    maturity: Optional[date] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        try:
+            maturity = date.fromisoformat(self.maturity_date)
+        except (ValueError, TypeError):
+            maturity = None
+        object.__setattr__(self, 'maturity', maturity)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TradingHours:
     """Часы торговли на Мосбирже"""
     premarket_start: time = time(6, 50)
@@ -29,7 +39,7 @@ class TradingHours:
     postmarket_end: time = time(16, 0)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class BacktestConfig:
     """Конфигурация бэктестинга"""
     initial_capital: float = 1_000_000.0
@@ -40,7 +50,7 @@ class BacktestConfig:
     take_profit_bp: float = 30.0
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SignalConfig:
     """Конфигурация торговых сигналов"""
     percentile_window: int = 252
@@ -50,7 +60,7 @@ class SignalConfig:
     exit_threshold_extreme: float = 90.0
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ExportConfig:
     """Конфигурация экспорта сигналов"""
     webhook_url: str = ""
@@ -60,165 +70,170 @@ class ExportConfig:
     api_key: str = ""
 
 
+# OFZ облигации для анализа (полные параметры с MOEX).
+# Собирается один раз при импорте; BondConfig неизменяемый, экземпляры общие
+_DEFAULT_BONDS: Mapping[str, BondConfig] = MappingProxyType({
+    "SU26221RMFS0": BondConfig(
+        isin="SU26221RMFS0",
+        name="ОФЗ 26221",
+        maturity_date="2033-03-23",
+        coupon_rate=7.7,
+        face_value=1000,
+        coupon_frequency=2,
+        issue_date="2017-02-15",
+    ),
+    "SU26225RMFS1": BondConfig(
+        isin="SU26225RMFS1",
+        name="ОФЗ 26225",
+        maturity_date="2034-05-10",
+        coupon_rate=7.25,
+        face_value=1000,
+        coupon_frequency=2,
+        issue_date="2018-02-21",
+    ),
+    "SU26230RMFS1": BondConfig(
+        isin="SU26230RMFS1",
+        name="ОФЗ 26230",
+        maturity_date="2039-03-16",
+        coupon_rate=7.7,
+        face_value=1000,
+        coupon_frequency=2,
+        issue_date="2019-06-05",
+    ),
+    "SU26238RMFS4": BondConfig(
+        isin="SU26238RMFS4",
+        name="ОФЗ 26238",
+        maturity_date="2041-05-15",
+        coupon_rate=7.1,
+        face_value=1000,
+        coupon_frequency=2,
+        issue_date="2021-06-16",
+    ),
+    "SU26240RMFS0": BondConfig(
+        isin="SU26240RMFS0",
+        name="ОФЗ 26240",
+        maturity_date="2036-07-30",
+        coupon_rate=7.0,
+        face_value=1000,
+        coupon_frequency=2,
+        issue_date="2021-06-30",
+    ),
+    "SU26241RMFS8": BondConfig(
+        isin="SU26241RMFS8",
+        name="ОФЗ 26241",
+        maturity_date="2032-11-17",
+        coupon_rate=9.5,
+        face_value=1000,
+        coupon_frequency=2,
+        issue_date="2022-11-16",
+    ),
+    "SU26243RMFS4": BondConfig(
+        isin="SU26243RMFS4",
+        name="ОФЗ 26243",
+        maturity_date="2038-05-19",
+        coupon_rate=9.8,
+        face_value=1000,
+        coupon_frequency=2,
+        issue_date="2023-06-21",
+    ),
+    "SU26244RMFS2": BondConfig(
+        isin="SU26244RMFS2",
+        name="ОФЗ 26244",
+        maturity_date="2034-03-15",
+        coupon_rate=11.25,
+        face_value=1000,
+        coupon_frequency=2,
+        issue_date="2023-10-25",
+    ),
+    "SU26245RMFS9": BondConfig(
+        isin="SU26245RMFS9",
+        name="ОФЗ 26245",
+        maturity_date="2035-09-26",
+        coupon_rate=12.0,
+        face_value=1000,
+        coupon_frequency=2,
+        issue_date="2024-05-15",
+    ),
+    "SU26246RMFS7": BondConfig(
+        isin="SU26246RMFS7",
+        name="ОФЗ 26246",
+        maturity_date="2036-03-12",
+        coupon_rate=12.0,
+        face_value=1000,
+        coupon_frequency=2,
+        issue_date="2024-05-15",
+    ),
+    "SU26247RMFS5": BondConfig(
+        isin="SU26247RMFS5",
+        name="ОФЗ 26247",
+        maturity_date="2039-05-11",
+        coupon_rate=12.25,
+        face_value=1000,
+        coupon_frequency=2,
+        issue_date="2024-05-15",
+    ),
+    "SU26248RMFS3": BondConfig(
+        isin="SU26248RMFS3",
+        name="ОФЗ 26248",
+        maturity_date="2040-05-16",
+        coupon_rate=12.25,
+        face_value=1000,
+        coupon_frequency=2,
+        issue_date="2024-05-15",
+    ),
+    "SU26250RMFS9": BondConfig(
+        isin="SU26250RMFS9",
+        name="ОФЗ 26250",
+        maturity_date="2037-06-10",
+        coupon_rate=12.0,
+        face_value=1000,
+        coupon_frequency=2,
+        issue_date="2025-06-25",
+    ),
+    "SU26252RMFS5": BondConfig(
+        isin="SU26252RMFS5",
+        name="ОФЗ 26252",
+        maturity_date="2033-10-12",
+        coupon_rate=12.5,
+        face_value=1000,
+        coupon_frequency=2,
+        issue_date="2025-10-22",
+    ),
+    "SU26253RMFS3": BondConfig(
+        isin="SU26253RMFS3",
+        name="ОФЗ 26253",
+        maturity_date="2038-10-06",
+        coupon_rate=13.0,
+        face_value=1000,
+        coupon_frequency=2,
+        issue_date="2025-10-22",
+    ),
+    "SU26254RMFS1": BondConfig(
+        isin="SU26254RMFS1",
+        name="ОФЗ 26254",
+        maturity_date="2040-10-03",
+        coupon_rate=13.0,
+        face_value=1000,
+        coupon_frequency=2,
+        issue_date="2025-10-22",
+    ),
+})
+
+
 @dataclass
 class AppConfig:
     """Главная конфигурация приложения"""
     
-    # OFZ облигации для анализа (полные параметры с MOEX)
-    bonds: Dict[str, BondConfig] = field(default_factory=lambda: {
-        "SU26221RMFS0": BondConfig(
-            isin="SU26221RMFS0",
-            name="ОФЗ 26221",
-            maturity_date="2033-03-23",
-            coupon_rate=7.7,
-            face_value=1000,
-            coupon_frequency=2,
-            issue_date="2017-02-15",
-        ),
-        "SU26225RMFS1": BondConfig(
-            isin="SU26225RMFS1",
-            name="ОФЗ 26225",
-            maturity_date="2034-05-10",
-            coupon_rate=7.25,
-            face_value=1000,
-            coupon_frequency=2,
-            issue_date="2018-02-21",
-        ),
-        "SU26230RMFS1": BondConfig(
-            isin="SU26230RMFS1",
-            name="ОФЗ 26230",
-            maturity_date="2039-03-16",
-            coupon_rate=7.7,
-            face_value=1000,
-            coupon_frequency=2,
-            issue_date="2019-06-05",
-        ),
-        "SU26238RMFS4": BondConfig(
-            isin="SU26238RMFS4",
-            name="ОФЗ 26238",
-            maturity_date="2041-05-15",
-            coupon_rate=7.1,
-            face_value=1000,
-            coupon_frequency=2,
-            issue_date="2021-06-16",
-        ),
-        "SU26240RMFS0": BondConfig(
-            isin="SU26240RMFS0",
-            name="ОФЗ 26240",
-            maturity_date="2036-07-30",
-            coupon_rate=7.0,
-            face_value=1000,
-            coupon_frequency=2,
-            issue_date="2021-06-30",
-        ),
-        "SU26241RMFS8": BondConfig(
-            isin="SU26241RMFS8",
-            name="ОФЗ 26241",
-            maturity_date="2032-11-17",
-            coupon_rate=9.5,
-            face_value=1000,
-            coupon_frequency=2,
-            issue_date="2022-11-16",
-        ),
-        "SU26243RMFS4": BondConfig(
-            isin="SU26243RMFS4",
-            name="ОФЗ 26243",
-            maturity_date="2038-05-19",
-            coupon_rate=9.8,
-            face_value=1000,
-            coupon_frequency=2,
-            issue_date="2023-06-21",
-        ),
-        "SU26244RMFS2": BondConfig(
-            isin="SU26244RMFS2",
-            name="ОФЗ 26244",
-            maturity_date="2034-03-15",
-            coupon_rate=11.25,
-            face_value=1000,
-            coupon_frequency=2,
-            issue_date="2023-10-25",
-        ),
-        "SU26245RMFS9": BondConfig(
-            isin="SU26245RMFS9",
-            name="ОФЗ 26245",
-            maturity_date="2035-09-26",
-            coupon_rate=12.0,
-            face_value=1000,
-            coupon_frequency=2,
-            issue_date="2024-05-15",
-        ),
-        "SU26246RMFS7": BondConfig(
-            isin="SU26246RMFS7",
-            name="ОФЗ 26246",
-            maturity_date="2036-03-12",
-            coupon_rate=12.0,
-            face_value=1000,
-            coupon_frequency=2,
-            issue_date="2024-05-15",
-        ),
-        "SU26247RMFS5": BondConfig(
-            isin="SU26247RMFS5",
-            name="ОФЗ 26247",
-            maturity_date="2039-05-11",
-            coupon_rate=12.25,
-            face_value=1000,
-            coupon_frequency=2,
-            issue_date="2024-05-15",
-        ),
-        "SU26248RMFS3": BondConfig(
-            isin="SU26248RMFS3",
-            name="ОФЗ 26248",
-            maturity_date="2040-05-16",
-            coupon_rate=12.25,
-            face_value=1000,
-            coupon_frequency=2,
-            issue_date="2024-05-15",
-        ),
-        "SU26250RMFS9": BondConfig(
-            isin="SU26250RMFS9",
-            name="ОФЗ 26250",
-            maturity_date="2037-06-10",
-            coupon_rate=12.0,
-            face_value=1000,
-            coupon_frequency=2,
-            issue_date="2025-06-25",
-        ),
-        "SU26252RMFS5": BondConfig(
-            isin="SU26252RMFS5",
-            name="ОФЗ 26252",
-            maturity_date="2033-10-12",
-            coupon_rate=12.5,
-            face_value=1000,
-            coupon_frequency=2,
-            issue_date="2025-10-22",
-        ),
-        "SU26253RMFS3": BondConfig(
-            isin="SU26253RMFS3",
-            name="ОФЗ 26253",
-            maturity_date="2038-10-06",
-            coupon_rate=13.0,
-            face_value=1000,
-            coupon_frequency=2,
-            issue_date="2025-10-22",
-        ),
-        "SU26254RMFS1": BondConfig(
-            isin="SU26254RMFS1",
-            name="ОФЗ 26254",
-            maturity_date="2040-10-03",
-            coupon_rate=13.0,
-            face_value=1000,
-            coupon_frequency=2,
-            issue_date="2025-10-22",
-        ),
-    })
+    # OFZ облигации для анализа (копия общей таблицы, без пересоздания BondConfig)
+    bonds: Dict[str, BondConfig] = field(default_factory=lambda: dict(_DEFAULT_BONDS))
     
     # Торговые пары для спредов
-    spread_pairs: List[tuple] = field(default_factory=lambda: [
+    spread_pairs: Tuple[Tuple[str, str], ...] = (
         ("SU26221RMFS0", "SU26225RMFS1"),
         ("SU26230RMFS1", "SU26238RMFS4"),
         ("SU26240RMFS0", "SU26241RMFS8"),
         ("SU26243RMFS4", "SU26244RMFS2"),
-    ])
+    )
     
     # API MOEX
     moex_base_url: str = "https://iss.moex.com/iss"
@@ -235,6 +250,3 @@ class AppConfig:
     auto_refresh_seconds: int = 60
     lookback_days: int = 365
 
-
-# Глобальный экземпляр конфигурации
-config = AppConfig()
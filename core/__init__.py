@@ -1,16 +1,32 @@
 """
 Core модули для аналитики
+
+Подмодули загружаются лениво (PEP 562): `import core.database` не тянет
+за собой расчёт спредов, сигналов и бэктест.
 """
-from .ytm_calculator import YTMCalculator
-from .spread import SpreadCalculator
-from .signals import SignalGenerator, TradingSignal
-from .backtest import Backtester, BacktestResult
+import importlib
+
+# Экспортируемое имя -> подмодуль
+_LAZY = {
+    "YTMCalculator": "ytm_calculator",
+    "SpreadCalculator": "spread",
+    "SignalGenerator": "signals",
+    "TradingSignal": "signals",
+    "Backtester": "backtest",
+    "BacktestResult": "backtest",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        module = importlib.import_module(f".{_LAZY[name]}", __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-__all__ = [
-    "YTMCalculator",
-    "SpreadCalculator",
-    "SignalGenerator",
-    "TradingSignal",
-    "Backtester",
-    "BacktestResult",
-]
\ No newline at end of file
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
\ No newline at end of file
@@ -7,6 +7,7 @@ from datetime import date, datetime, timedelta
 from typing import Optional, Dict, List, Tuple, Any
 from dataclasses import dataclass, field
 from enum import Enum
+import math
 import logging
 
 from .signals import SignalType, SignalDirection, TradingSignal
@@ -348,18 +349,25 @@ class Backtester:
         capital = self.config.initial_capital
         equity_curve = [capital]
         
-        for i in range(len(df)):
-            current_date = df.index[i].date() if hasattr(df.index[i], 'date') else df.index[i]
-            row = df.iloc[i]
-            
+        # Колонки - списками Python float один раз; в цикле только индексы
+        # (без pd.Series на строку и поиска по ключам)
+        dates = [ts.date() if hasattr(ts, 'date') else ts for ts in df.index]
+        spread = df["spread_bp"].tolist()
+        p10 = df["p10"].tolist()
+        p50 = df["p50"].tolist()
+        p90 = df["p90"].tolist()
+        ytm_long = df["ytm_long"].tolist()
+        ytm_short = df["ytm_short"].tolist()
+        
+        for i, current_date in enumerate(dates):
             # Пропускаем если нет перцентилей
-            if pd.isna(row.get("p10")) or pd.isna(row.get("p90")):
+            if math.isnan(p10[i]) or math.isnan(p90[i]):
                 continue
             
             # Управление открытой позицией
             if current_position and current_position.state == PositionState.OPEN:
                 current_position = self._manage_position(
-                    current_position, row, current_date, capital
+                    current_position, spread[i], p50[i], current_date, capital
                 )
                 
                 if current_position.state != PositionState.OPEN:
@@ -370,7 +378,7 @@ class Backtester:
             
             # Открытие новой позиции
             if current_position is None:
-                signal = self._check_entry_signal(row)
+                signal = self._check_entry_signal(spread[i], p10[i], p90[i])
                 
                 if signal:
                     position_size = capital * self.config.position_size_pct
@@ -378,9 +386,9 @@ class Backtester:
                         pair_name=pair_name,
                         direction=signal,
                         entry_date=current_date,
-                        entry_spread=row["spread_bp"],
-                        entry_ytm_long=row["ytm_long"],
-                        entry_ytm_short=row["ytm_short"],
+                        entry_spread=spread[i],
+                        entry_ytm_long=ytm_long[i],
+                        entry_ytm_short=ytm_short[i],
                         size=position_size,
                         stop_loss_bp=self.config.stop_loss_bp,
                         take_profit_bp=self.config.take_profit_bp
@@ -388,13 +396,9 @@ class Backtester:
         
         return positions
     
-    def _check_entry_signal(self, row: pd.Series) -> Optional[SignalDirection]:
+    def _check_entry_signal(self, spread: float, p10: float, p90: float) -> Optional[SignalDirection]:
         """Проверить сигнал на вход"""
-        spread = row["spread_bp"]
-        p10 = row.get("p10")
-        p90 = row.get("p90")
-        
-        if pd.isna(p10) or pd.isna(p90):
+        if math.isnan(p10) or math.isnan(p90):
             return None
         
         # Спред ниже P10 - покупка (ожидаем расширение)
@@ -410,14 +414,13 @@ class Backtester:
     def _manage_position(
         self,
         position: Position,
-        row: pd.Series,
+        current_spread: float,
+        p50: float,
         current_date: date,
         capital: float
     ) -> Position:
         """Управление открытой позицией"""
-        current_spread = row["spread_bp"]
         spread_change = current_spread - position.entry_spread
-        p50 = row.get("p50", position.entry_spread)
         
         # Расчёт P&L в базисных пунктах
         if position.direction == SignalDirection.LONG_SHORT:
@@ -504,47 +507,45 @@ class Backtester:
         result.positions = positions
         result.total_trades = len(positions)
         
+        # P&L и длительность позиций - массивами за один проход по списку
+        count = len(positions)
+        pnl_bp = np.fromiter((p.pnl_bp for p in positions), dtype=np.float64, count=count)
+        pnl_rub = np.fromiter((p.pnl_rub for p in positions), dtype=np.float64, count=count)
+        holding_days = np.fromiter((p.holding_days for p in positions), dtype=np.float64, count=count)
+        
+        winning = pnl_bp > 0
+        
         # Подсчёт выигрышей/проигрышей
-        for pos in positions:
-            result.total_pnl_bp += pos.pnl_bp
-            result.total_pnl_rub += pos.pnl_rub
-            
-            if pos.pnl_bp > 0:
-                result.winning_trades += 1
-            else:
-                result.losing_trades += 1
+        result.total_pnl_bp = float(pnl_bp.sum())
+        result.total_pnl_rub = float(pnl_rub.sum())
+        result.winning_trades = int(winning.sum())
+        result.losing_trades = count - result.winning_trades
         
         # Win rate
         result.win_rate = result.winning_trades / result.total_trades * 100
         
         # Средние значения
         result.avg_pnl_bp = result.total_pnl_bp / result.total_trades
-        result.avg_holding_days = np.mean([p.holding_days for p in positions])
+        result.avg_holding_days = holding_days.mean()
         
         if result.winning_trades > 0:
-            result.avg_winning_bp = np.mean([p.pnl_bp for p in positions if p.pnl_bp > 0])
+            result.avg_winning_bp = pnl_bp[winning].mean()
         
         if result.losing_trades > 0:
-            result.avg_losing_bp = np.mean([p.pnl_bp for p in positions if p.pnl_bp <= 0])
+            result.avg_losing_bp = pnl_bp[~winning].mean()
         
         # Profit Factor
-        gross_profit = sum(p.pnl_bp for p in positions if p.pnl_bp > 0)
-        gross_loss = abs(sum(p.pnl_bp for p in positions if p.pnl_bp <= 0))
+        gross_profit = pnl_bp[winning].sum()
+        gross_loss = abs(pnl_bp[~winning].sum())
         result.profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0
         
         # P&L в процентах
         result.total_pnl_percent = result.total_pnl_rub / self.config.initial_capital * 100
         
-        # Max Drawdown
-        cumulative_pnl = 0
-        max_pnl = 0
-        max_drawdown = 0
-        
-        for pos in positions:
-            cumulative_pnl += pos.pnl_bp
-            max_pnl = max(max_pnl, cumulative_pnl)
-            drawdown = max_pnl - cumulative_pnl
-            max_drawdown = max(max_drawdown, drawdown)
+        # Max Drawdown: от максимума накопленного P&L (не ниже нуля)
+        cumulative_pnl = np.cumsum(pnl_bp)
+        max_pnl = np.maximum.accumulate(np.maximum(cumulative_pnl, 0))
+        max_drawdown = float((max_pnl - cumulative_pnl).max())
         
         result.max_drawdown_bp = max_drawdown
         
@@ -13,6 +13,8 @@ SQLite база данных для хранения исторических д
 import sqlite3
 import os
 import json
+import threading
+from contextlib import contextmanager
 from datetime import datetime, date, timedelta
 from typing import Optional, List, Dict, Any, Tuple
 import pandas as pd
@@ -253,11 +255,86 @@ def init_database():
     logger.info("База данных инициализирована")
 
 
+def _column_values(df: pd.DataFrame, column: str) -> List[Any]:
+    """Значения колонки списком (None если колонки нет)"""
+    if column in df.columns:
+        return df[column].tolist()
+    return [None] * len(df)
+
+
+def _format_dates(values: Any, fmt: str) -> List[str]:
+    """Даты строками для SQLite (не-даты приводятся через str)"""
+    return [
+        value.strftime(fmt) if isinstance(value, (datetime, pd.Timestamp)) else str(value)
+        for value in values
+    ]
+
+
 class DatabaseManager:
     """Менеджер для работы с БД"""
     
     def __init__(self):
         init_database()
+        # Соединение открытой транзакции - своё для каждого потока
+        self._local = threading.local()
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Объединить несколько сохранений в одну транзакцию
+        
+        Внутри блока save_daily_ytm/save_intraday_ytm пишут через общее
+        соединение без собственных commit; фиксация одна, при выходе из блока.
+        """
+        conn = get_connection()
+        # Явный BEGIN: иначе SAVEPOINT внутри _write_rows стал бы внешней
+        # транзакцией и его RELEASE фиксировал бы запись раньше времени
+        conn.execute('BEGIN')
+        self._local.conn = conn
+        try:
+            yield
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._local.conn = None
+            conn.close()
+    
+    def _write_rows(self, query: str, rows: List[Tuple]) -> int:
+        """
+        Записать строки одним executemany (в открытой транзакции, если она есть)
+        
+        Запись идёт под SAVEPOINT: если executemany падает, уже вставленные
+        строки откатываются и запись повторяется построчно, пропуская
+        строки с ошибкой.
+        
+        Returns:
+            Количество записанных строк
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            with self.transaction():
+                return self._write_rows(query, rows)
+        
+        conn.execute('SAVEPOINT write_rows')
+        try:
+            conn.executemany(query, rows)
+            saved_count = len(rows)
+        except sqlite3.Error as e:
+            conn.execute('ROLLBACK TO write_rows')
+            logger.warning(f"Ошибка пакетной записи, повтор построчно: {e}")
+            
+            saved_count = 0
+            for row in rows:
+                try:
+                    conn.execute(query, row)
+                    saved_count += 1
+                except sqlite3.Error as e:
+                    logger.warning(f"Ошибка сохранения строки {row[:3]}: {e}")
+        conn.execute('RELEASE write_rows')
+        
+        return saved_count
     
     # ==========================================
     # ДНЕВНЫЕ YTM (DAILY MODE)
@@ -281,39 +358,27 @@ class DatabaseManager:
         if df.empty:
             return 0
         
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        saved_count = 0
-        
-        for idx, row in df.iterrows():
-            try:
-                # Дата
-                if isinstance(idx, pd.Timestamp):
-                    date_str = idx.strftime('%Y-%m-%d')
-                elif hasattr(row, 'date'):
-                    date_str = row['date'].strftime('%Y-%m-%d') if isinstance(row['date'], (datetime, pd.Timestamp)) else str(row['date'])
-                else:
-                    date_str = str(idx)
-                
-                cursor.execute('''
-                    INSERT OR REPLACE INTO daily_ytm 
-                    (isin, date, ytm, price, duration_days)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (
-                    isin,
-                    date_str,
-                    row.get('ytm'),
-                    row.get('price'),
-                    row.get('duration_days')
-                ))
-                saved_count += 1
-                
-            except Exception as e:
-                logger.warning(f"Ошибка сохранения daily YTM {date_str}: {e}")
-        
-        conn.commit()
-        conn.close()
+        # Дата: из индекса или колонки date
+        if isinstance(df.index, pd.DatetimeIndex):
+            dates = df.index.strftime('%Y-%m-%d').tolist()
+        elif 'date' in df.columns:
+            dates = _format_dates(df['date'], '%Y-%m-%d')
+        else:
+            dates = [str(idx) for idx in df.index]
+        
+        rows = list(zip(
+            [isin] * len(df),
+            dates,
+            _column_values(df, 'ytm'),
+            _column_values(df, 'price'),
+            _column_values(df, 'duration_days')
+        ))
+        
+        saved_count = self._write_rows('''
+            INSERT OR REPLACE INTO daily_ytm 
+            (isin, date, ytm, price, duration_days)
+            VALUES (?, ?, ?, ?, ?)
+        ''', rows)
         
         logger.info(f"Сохранено {saved_count} дневных YTM для {isin}")
         return saved_count
@@ -360,7 +425,7 @@ class DatabaseManager:
         if df.empty:
             return pd.DataFrame()
         
-        df['date'] = pd.to_datetime(df['date'])
+        df['date'] = pd.to_datetime(df['date'], format='ISO8601')
         df = df.set_index('date')
         
         return df
@@ -407,37 +472,25 @@ class DatabaseManager:
         if df.empty:
             return 0
         
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        saved_count = 0
-        
-        for idx, row in df.iterrows():
-            try:
-                if isinstance(idx, pd.Timestamp):
-                    dt_str = idx.strftime('%Y-%m-%d %H:%M:%S')
-                else:
-                    dt_str = str(idx)
-                
-                cursor.execute('''
-                    INSERT OR REPLACE INTO intraday_ytm 
-                    (isin, interval, datetime, price_close, ytm, accrued_interest)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
-                    isin,
-                    interval,
-                    dt_str,
-                    row.get('close'),
-                    row.get('ytm_close'),
-                    row.get('accrued_interest')
-                ))
-                saved_count += 1
-                
-            except Exception as e:
-                logger.warning(f"Ошибка сохранения intraday YTM {dt_str}: {e}")
-        
-        conn.commit()
-        conn.close()
+        if isinstance(df.index, pd.DatetimeIndex):
+            datetimes = df.index.strftime('%Y-%m-%d %H:%M:%S').tolist()
+        else:
+            datetimes = _format_dates(df.index, '%Y-%m-%d %H:%M:%S')
+        
+        rows = list(zip(
+            [isin] * len(df),
+            [interval] * len(df),
+            datetimes,
+            _column_values(df, 'close'),
+            _column_values(df, 'ytm_close'),
+            _column_values(df, 'accrued_interest')
+        ))
+        
+        saved_count = self._write_rows('''
+            INSERT OR REPLACE INTO intraday_ytm 
+            (isin, interval, datetime, price_close, ytm, accrued_interest)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', rows)
         
         logger.info(f"Сохранено {saved_count} intraday YTM для {isin} (interval={interval})")
         return saved_count
@@ -486,7 +539,7 @@ class DatabaseManager:
         if df.empty:
             return pd.DataFrame()
         
-        df['datetime'] = pd.to_datetime(df['datetime'])
+        df['datetime'] = pd.to_datetime(df['datetime'], format='ISO8601')
         df = df.set_index('datetime')
         
         # Для совместимости с текущим кодом
@@ -655,8 +708,9 @@ class DatabaseManager:
         if df.empty:
             return pd.DataFrame()
         
-        # Используем format='mixed' для разных форматов datetime
-        df['datetime'] = pd.to_datetime(df['datetime'], format='mixed')
+        # В БД только ISO-строки (с временем или без): ISO8601 разбирает их
+        # без угадывания формата для каждой строки, как format='mixed'
+        df['datetime'] = pd.to_datetime(df['datetime'], format='ISO8601')
         df = df.set_index('datetime')
         
         # Для совместимости
@@ -747,7 +801,7 @@ class DatabaseManager:
         if df.empty:
             return pd.DataFrame()
         
-        df['datetime'] = pd.to_datetime(df['datetime'])
+        df['datetime'] = pd.to_datetime(df['datetime'], format='ISO8601')
         df = df.set_index('datetime')
         
         return df
@@ -853,7 +907,7 @@ class DatabaseManager:
         conn.close()
         
         if not df.empty:
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
+            df['timestamp'] = pd.to_datetime(df['timestamp'], format='ISO8601')
         
         return df
     
@@ -1111,7 +1165,7 @@ class DatabaseManager:
             isin = bond['isin']
             result[isin] = {
                 'isin': isin,
-                'name': bond.get('name', ''),
+                'name': bond.get('name') or bond.get('short_name') or isin,
                 'maturity_date': bond.get('maturity_date', ''),
                 'coupon_rate': bond.get('coupon_rate'),
                 'face_value': bond.get('face_value', 1000),
@@ -1344,7 +1398,7 @@ def load_intraday_history(
     conn.close()
     
     if not df.empty:
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        df['timestamp'] = pd.to_datetime(df['timestamp'], format='ISO8601')
         df = df.set_index('timestamp')
     
     return df
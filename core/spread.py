@@ -123,23 +123,28 @@ class SpreadCalculator:
         if spread_window.empty:
             raise ValueError("Пустой ряд спредов")
         
-        current = spread_window.iloc[-1]
-        mean = spread_window.mean()
-        std = spread_window.std()
+        values = spread_window.to_numpy(dtype=np.float64)
+        
+        current = values[-1]
+        mean = values.mean()
+        std = values.std(ddof=1) if len(values) > 1 else np.nan
         
         zscore = (current - mean) / std if std > 0 else 0
         
+        # Все перцентили одной сортировкой окна
+        p10, p25, p50, p75, p90 = np.quantile(values, [0.1, 0.25, 0.5, 0.75, 0.9])
+        
         return SpreadStats(
             current=round(current, 2),
             mean=round(mean, 2),
             std=round(std, 2),
-            min=round(spread_window.min(), 2),
-            max=round(spread_window.max(), 2),
-            percentile_10=round(np.percentile(spread_window, 10), 2),
-            percentile_25=round(np.percentile(spread_window, 25), 2),
-            percentile_50=round(np.percentile(spread_window, 50), 2),
-            percentile_75=round(np.percentile(spread_window, 75), 2),
-            percentile_90=round(np.percentile(spread_window, 90), 2),
+            min=round(values.min(), 2),
+            max=round(values.max(), 2),
+            percentile_10=round(p10, 2),
+            percentile_25=round(p25, 2),
+            percentile_50=round(p50, 2),
+            percentile_75=round(p75, 2),
+            percentile_90=round(p90, 2),
             zscore=round(zscore, 2),
             lookback_days=len(spread_window)
         )
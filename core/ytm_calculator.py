@@ -1,7 +1,7 @@
 """
 Расчёт доходности к погашению (YTM) для облигаций ОФЗ
 """
-from datetime import date, datetime, timedelta
+from datetime import date, timedelta
 from typing import Optional, Dict, Any, List
 from dataclasses import dataclass
 import math
@@ -424,6 +424,22 @@ class YTMCalculator:
         return mid
 
 
+def parse_maturity(bond_config: Any) -> date:
+    """
+    Дата погашения облигации
+    
+    Берёт уже разобранную дату BondConfig.maturity, иначе разбирает
+    строку maturity_date (для других объектов с атрибутами облигации).
+    
+    Raises:
+        ValueError, TypeError: Неверная дата погашения
+    """
+    maturity = getattr(bond_config, 'maturity', None)
+    if maturity is None:
+        maturity = date.fromisoformat(bond_config.maturity_date)
+    return maturity
+
+
 def calculate_ytm_from_price(
     price_percent: float,
     bond_config: Any,
@@ -442,7 +458,7 @@ def calculate_ytm_from_price(
     """
     # Конвертируем BondConfig в BondParams
     try:
-        maturity = datetime.strptime(bond_config.maturity_date, "%Y-%m-%d").date()
+        maturity = parse_maturity(bond_config)
     except (ValueError, TypeError):
         logger.warning(f"Неверная дата погашения: {bond_config.maturity_date}")
         return None
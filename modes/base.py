@@ -269,9 +269,17 @@ class DailyMode:
         ytm_data = {}
         isins = list(self.config.bonds.keys())
         
+        # Один запрос на пачку облигаций вместо запроса на каждую;
+        # ошибки пачки батч-метод логирует сам и помечает has_data=False
+        try:
+            batch = self.history_fetcher.get_trading_data_batch(isins)
+        except Exception as e:
+            logger.warning(f"Error fetching trading data batch: {e}")
+            batch = {}
+        
         for isin in isins:
             try:
-                trading_data = self.history_fetcher.get_trading_data(isin)
+                trading_data = batch.get(isin) or {}
                 
                 if trading_data.get("has_data") and trading_data.get("yield"):
                     # Создаём DataFrame с одним значением
@@ -97,6 +97,7 @@ class IntradayMode:
         # Кэш
         self._candles_cache: Dict[str, pd.DataFrame] = {}
         self._history_cache: Dict[str, pd.DataFrame] = {}
+        self._history_loaded_at: Optional[datetime] = None
     
     def run(self) -> IntradayModeResult:
         """
@@ -135,12 +136,15 @@ class IntradayMode:
             result.data_available = False
             return result
         
-        # 3. Загружаем историю для перцентилей
-        start_date = date.today() - timedelta(days=self.config.lookback_days)
-        self._history_cache = self.history_fetcher.fetch_multi_bonds_history(
-            isins,
-            start_date=start_date
-        )
+        # 3. Загружаем историю для перцентилей (внутри дня не меняется -
+        # перезапрашиваем не чаще cache_ttl_seconds)
+        if not self._history_is_fresh():
+            start_date = date.today() - timedelta(days=self.config.lookback_days)
+            self._history_cache = self.history_fetcher.fetch_multi_bonds_history(
+                isins,
+                start_date=start_date
+            )
+            self._history_loaded_at = datetime.now()
         
         # 4. Обрабатываем каждую пару
         for bond_long, bond_short in self.config.spread_pairs:
@@ -232,6 +236,13 @@ class IntradayMode:
         self._candles_cache.clear()
         return self.run()
     
+    def _history_is_fresh(self) -> bool:
+        """Загружена ли история не раньше cache_ttl_seconds назад"""
+        if self._history_loaded_at is None:
+            return False
+        age = (datetime.now() - self._history_loaded_at).total_seconds()
+        return age < self.config.cache_ttl_seconds
+    
     def _get_all_isins(self) -> List[str]:
         """Получить все уникальные ISIN из пар"""
         isins = set()
@@ -344,17 +355,19 @@ class IntradayMode:
         if not points:
             return {}
         
-        spreads = [p.spread_bp for p in points]
+        # Спреды - одним массивом, все метрики считаются по нему
+        spreads = np.fromiter((p.spread_bp for p in points), dtype=np.float64, count=len(points))
+        first, last = float(spreads[0]), float(spreads[-1])
         
         return {
-            "open": spreads[0],
-            "current": spreads[-1],
-            "high": max(spreads),
-            "low": min(spreads),
-            "mean": round(np.mean(spreads), 2),
-            "std": round(np.std(spreads), 2),
-            "change": round(spreads[-1] - spreads[0], 2),
-            "change_pct": round((spreads[-1] - spreads[0]) / spreads[0] * 100, 2) if spreads[0] != 0 else 0,
+            "open": first,
+            "current": last,
+            "high": float(spreads.max()),
+            "low": float(spreads.min()),
+            "mean": round(spreads.mean(), 2),
+            "std": round(spreads.std(), 2),
+            "change": round(last - first, 2),
+            "change_pct": round((last - first) / first * 100, 2) if first != 0 else 0,
             "data_points": len(points)
         }
     
@@ -0,0 +1,70 @@
+"""
+Тесты графиков YTM и спреда в app.py
+
+Запуск:
+    pytest tests/test_app_charts.py -v
+"""
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Добавляем родительскую директорию в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_ytm_chart, create_spread_chart
+
+
+def make_ytm(n: int, freq: str = "D", start: str = "2025-01-01") -> pd.DataFrame:
+    """DataFrame с YTM облигации"""
+    index = pd.date_range(start, periods=n, freq=freq)
+    return pd.DataFrame({"ytm": np.linspace(14.0, 15.0, n)}, index=index)
+
+
+def make_spread(n: int, freq: str = "D") -> pd.DataFrame:
+    """merged_df для графика спреда"""
+    return pd.DataFrame({
+        "date": pd.date_range("2025-01-01", periods=n, freq=freq),
+        "spread": np.sin(np.linspace(0, 10, n)) * 20 + 100,
+    })
+
+
+STATS = {"mean": 100.0, "p10": 85.0, "p25": 92.0, "p75": 108.0, "p90": 115.0}
+
+
+class TestWebglPolicy:
+    """Класс трейса выбирается по числу точек, а не по режиму"""
+
+    def test_short_intraday_uses_svg(self):
+        """Короткий внутридневной ряд рисуется SVG"""
+        df = make_ytm(50, freq="min")
+
+        ytm = create_ytm_chart(df, df, "A", "B", is_intraday=True)
+        spread = create_spread_chart(make_spread(50, freq="min"), STATS, is_intraday=True)
+
+        assert {t.type for t in ytm.data} == {"scatter"}
+        assert {t.type for t in spread.data} == {"scatter"}
+
+
+class TestSpreadLevelAxis:
+    """Подписи уровней спреда на правой оси"""
+
+    def test_level_ticks(self):
+        """Метки P25, среднего и P75 на правой оси"""
+        fig = create_spread_chart(make_spread(30), STATS)
+
+        axis = fig.layout.yaxis2
+        assert axis.overlaying == "y" and axis.side == "right"
+        assert list(axis.tickvals) == [92.0, 100.0, 108.0]
+        assert list(axis.ticktext) == ["P25: 92.00", "Среднее: 100.00", "P75: 108.00"]
+
+    def test_axis_has_trace(self):
+        """К правой оси привязан невидимый трейс - иначе она не отрисуется"""
+        fig = create_spread_chart(make_spread(30), STATS)
+
+        level_traces = [t for t in fig.data if t.yaxis == "y2"]
+        assert len(level_traces) == 1
+        assert level_traces[0].showlegend is False
+        assert level_traces[0].hoverinfo == "skip"
+        assert level_traces[0].marker.opacity == 0
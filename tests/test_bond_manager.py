@@ -265,6 +265,41 @@ class TestBondManagerIntegration(unittest.TestCase):
         assert "25" in text
 
 
+class TestSortBondsForDisplay(unittest.TestCase):
+    """Тесты сортировки облигаций в модальном окне"""
+
+    def setUp(self):
+        from components.bond_manager import sort_bonds_for_display
+        self.sort = sort_bonds_for_display
+        self.bonds = [
+            {"isin": "A", "name": "ОФЗ 26240", "duration_years": 10.0, "last_ytm": 9.5, "is_favorite": 0},
+            {"isin": "B", "name": "ОФЗ 26221", "duration_years": 2.5, "last_ytm": 10.5, "is_favorite": 1},
+            {"isin": "C", "name": "ОФЗ 26230", "duration_years": None, "last_ytm": None, "is_favorite": 0},
+            {"isin": "D", "name": "ОФЗ 26225", "duration_years": 5.0, "last_ytm": 12.0, "is_favorite": 1},
+        ]
+
+    def test_favorites_first_then_duration(self):
+        """Избранные наверху, внутри групп - по дюрации, пустые в конце"""
+        result = [b["isin"] for b in self.sort(self.bonds, "Дюрации")]
+        assert result == ["B", "D", "A", "C"]
+
+    def test_sort_by_ytm_numeric(self):
+        """YTM сортируется как число, а не как строка"""
+        result = [b["isin"] for b in self.sort(self.bonds, "YTM")]
+        assert result == ["B", "D", "A", "C"]
+
+    def test_sort_by_name(self):
+        """Сортировка по названию"""
+        result = [b["isin"] for b in self.sort(self.bonds, "Названию")]
+        assert result == ["B", "D", "C", "A"]
+
+    def test_input_not_modified(self):
+        """Исходный список не меняется"""
+        original = [b["isin"] for b in self.bonds]
+        self.sort(self.bonds, "YTM")
+        assert [b["isin"] for b in self.bonds] == original
+
+
 def run_tests():
     """Запуск всех тестов"""
     loader = unittest.TestLoader()
@@ -274,6 +309,7 @@ def run_tests():
     suite.addTests(loader.loadTestsFromTestCase(TestBondManagerLogic))
     suite.addTests(loader.loadTestsFromTestCase(TestBondManagerUI))
     suite.addTests(loader.loadTestsFromTestCase(TestBondManagerIntegration))
+    suite.addTests(loader.loadTestsFromTestCase(TestSortBondsForDisplay))
 
     runner = unittest.TextTestRunner(verbosity=2)
     result = runner.run(suite)
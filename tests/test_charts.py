@@ -0,0 +1,549 @@
+"""
+Тесты для построителя графиков (components/charts.py)
+
+Запуск:
+    pytest tests/test_charts.py -v
+"""
+import sys
+import os
+import json
+from dataclasses import dataclass
+from datetime import datetime, date, timedelta
+
+import pandas as pd
+import pytest
+
+# Добавляем родительскую директорию в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from components.charts import (
+    ChartBuilder, intraday_to_frame, INTRADAY_COLUMNS,
+    lttb_indices, downsample_xy, hline_layout, hline_shape,
+)
+
+
+@dataclass
+class FakeIntradayPoint:
+    """Упрощённый IntradayPoint для тестов"""
+    time: datetime
+    ytm_long: float
+    ytm_short: float
+    spread_bp: float
+
+
+def make_points(n: int = 5):
+    """Создать список внутридневных точек"""
+    start = datetime(2026, 2, 27, 10, 0)
+    return [
+        FakeIntradayPoint(
+            time=start + timedelta(hours=i),
+            ytm_long=15.0 + i * 0.01,
+            ytm_short=14.0 + i * 0.02,
+            spread_bp=100.0 - i,
+        )
+        for i in range(n)
+    ]
+
+
+class TestIntradayChart:
+    """Тесты внутридневного графика"""
+
+    def test_intraday_to_frame_from_points(self):
+        """Список точек преобразуется в DataFrame за один проход"""
+        df = intraday_to_frame(make_points(3))
+
+        assert list(df.columns) == INTRADAY_COLUMNS
+        assert len(df) == 3
+        assert df["spread_bp"].tolist() == [100.0, 99.0, 98.0]
+
+    def test_intraday_to_frame_passthrough(self):
+        """DataFrame возвращается без копирования"""
+        df = intraday_to_frame(make_points(3))
+        assert intraday_to_frame(df) is df
+
+    def test_list_and_frame_give_same_chart(self):
+        """Список точек и DataFrame дают одинаковые трейсы"""
+        builder = ChartBuilder()
+        points = make_points(4)
+
+        fig_list = builder.create_intraday_chart(points, "A_B")
+        fig_df = builder.create_intraday_chart(intraday_to_frame(points), "A_B")
+
+        assert len(fig_list.data) == 3
+        for t1, t2 in zip(fig_list.data, fig_df.data):
+            assert list(t1.y) == list(t2.y)
+
+    def test_webgl_only_for_many_points(self):
+        """Короткий внутридневной ряд - SVG, длинный - WebGL"""
+        builder = ChartBuilder()
+        long_df = intraday_to_frame(make_points(2500))
+
+        short_fig = builder.create_intraday_chart(make_points(5), "A_B")
+        long_fig = builder.create_intraday_chart(long_df, "A_B")
+
+        assert {t.type for t in short_fig.data} == {"scatter"}
+        assert {t.type for t in long_fig.data} == {"scattergl"}
+
+
+class TestDownsampling:
+    """Тесты прореживания LTTB"""
+
+    def test_short_series_unchanged(self):
+        """Короткий ряд не прореживается"""
+        index = pd.date_range("2026-01-01", periods=10, freq="D")
+        x, y = downsample_xy(index, range(10), max_points=20)
+
+        assert len(x) == 10
+        assert y.tolist() == list(range(10))
+
+    def test_keeps_endpoints_and_extremes(self):
+        """Сохраняются крайние точки и выброс"""
+        import numpy as np
+
+        n = 10_000
+        index = pd.date_range("2025-01-01", periods=n, freq="min")
+        y = np.sin(np.linspace(0, 20, n))
+        y[5_000] = 10.0
+
+        x_out, y_out = downsample_xy(index, y, max_points=500)
+
+        assert len(x_out) == 500
+        assert x_out[0] == index[0] and x_out[-1] == index[-1]
+        assert y_out.max() == 10.0
+        assert (np.diff(x_out.astype("int64")) > 0).all()
+
+    def test_datetime_unit_independent(self):
+        """Отбор точек не зависит от единицы времени индекса"""
+        import numpy as np
+
+        n = 5_000
+        y = np.cos(np.linspace(0, 30, n))
+        index_ns = pd.date_range("2025-01-01", periods=n, freq="min", unit="ns")
+        index_s = index_ns.as_unit("s")
+
+        _, y_ns = downsample_xy(index_ns, y, max_points=300)
+        x_s, y_s = downsample_xy(index_s, y, max_points=300)
+
+        assert np.array_equal(y_ns, y_s)
+        assert x_s.dtype == np.dtype("datetime64[s]")
+
+    def test_object_dates(self):
+        """Ось из datetime.date (object) прореживается как datetime64"""
+        import numpy as np
+
+        max_points = 300
+        index = pd.date_range("2020-01-01", periods=max_points + 1, freq="D")
+        dates = np.array([ts.date() for ts in index], dtype=object)
+        y = np.sin(np.linspace(0, 10, max_points + 1))
+
+        x_out, y_out = downsample_xy(dates, y, max_points=max_points)
+        _, y_expected = downsample_xy(index, y, max_points=max_points)
+
+        assert len(x_out) == max_points
+        assert isinstance(x_out[0], date)
+        assert np.array_equal(y_out, y_expected)
+
+    def test_tz_aware_index(self):
+        """tz-aware индекс прореживается, значения X остаются исходными"""
+        import numpy as np
+
+        max_points = 300
+        index = pd.date_range("2026-01-01 10:00", periods=max_points + 1,
+                              freq="min", tz="Europe/Moscow")
+        y = np.cos(np.linspace(0, 10, max_points + 1))
+
+        x_out, y_out = downsample_xy(index, y, max_points=max_points)
+        _, y_expected = downsample_xy(index.tz_localize(None), y, max_points=max_points)
+
+        assert len(x_out) == max_points
+        assert x_out[0] == index[0] and x_out[-1] == index[-1]
+        assert np.array_equal(y_out, y_expected)
+
+    def test_non_numeric_x_bucketed_by_position(self):
+        """Нечисловая ось X без дат прореживается по номеру точки"""
+        import numpy as np
+
+        labels = np.array([f"t{i}" for i in range(301)], dtype=object)
+
+        x_out, y_out = downsample_xy(labels, np.arange(301.0), max_points=300)
+
+        assert len(x_out) == 300
+        assert x_out[0] == "t0" and x_out[-1] == "t300"
+
+    def test_chart_builders_cap_points(self):
+        """Построители графиков прореживают длинные ряды"""
+        import numpy as np
+
+        n = 5_000
+        index = pd.date_range("2025-01-01", periods=n, freq="min")
+        values = np.linspace(10.0, 20.0, n)
+        builder = ChartBuilder()
+
+        ytm = builder.create_ytm_chart(pd.DataFrame({"A": values}, index=index), max_points=400)
+        spread = builder.create_spread_chart(pd.DataFrame({"A_B": values}, index=index), max_points=400)
+        signal = builder.create_signal_chart(pd.Series(values, index=index), [], max_points=400)
+
+        assert len(ytm.data[0].y) == 400
+        assert len(spread.data[0].y) == 400
+        assert len(signal.data[0].y) == 400
+        # Текущая точка берётся из полного ряда
+        assert signal.data[1].y[0] == values[-1]
+
+    def test_nan_not_selected(self):
+        """NaN не вытесняет реальные точки"""
+        import numpy as np
+
+        y = np.arange(100, dtype=float)
+        y[10::7] = np.nan
+
+        idx = lttb_indices(np.arange(100), y, 20)
+
+        assert len(idx) == 20
+        assert not np.isnan(y[idx[1:-1]]).any()
+
+
+class TestHlineLayout:
+    """Тесты пакетного построения горизонтальных линий"""
+
+    @pytest.mark.parametrize("position", ["top right", "right", "left"])
+    def test_matches_add_hline(self, position):
+        """Результат совпадает с fig.add_hline"""
+        import plotly.graph_objects as go
+
+        expected = go.Figure()
+        expected.add_hline(
+            y=1.5, line_dash="dot", line_color="red",
+            annotation_text="P75", annotation_position=position
+        )
+
+        shapes, annotations = hline_layout([(1.5, "P75", "red", "dot", position)])
+        actual = go.Figure()
+        actual.update_layout(shapes=shapes, annotations=annotations)
+
+        assert actual.layout.shapes == expected.layout.shapes
+        assert actual.layout.annotations == expected.layout.annotations
+
+    def test_shape_without_annotation(self):
+        """Линия без подписи совпадает с fig.add_hline без annotation_text"""
+        import plotly.graph_objects as go
+
+        expected = go.Figure()
+        expected.add_hline(y=2.0, line_dash="dash", line_color="gray")
+
+        actual = go.Figure()
+        actual.update_layout(shapes=[hline_shape(2.0, "gray", "dash")])
+
+        assert actual.layout.shapes == expected.layout.shapes
+        assert not actual.layout.annotations
+
+    def test_spread_chart_percentiles(self):
+        """График спредов: полосы P10-P90, P25-P75 и линия среднего"""
+        from types import SimpleNamespace
+
+        index = pd.date_range("2026-01-01", periods=5, freq="D")
+        spread = pd.DataFrame({"A_B": [100.0, 101.0, 99.0, 102.0, 98.0]}, index=index)
+        stats = SimpleNamespace(
+            percentile_10=98.5, percentile_25=99.0,
+            percentile_75=101.0, percentile_90=101.5, mean=100.0
+        )
+
+        fig = ChartBuilder().create_spread_chart(spread, {"A_B": stats})
+
+        assert [s.type for s in fig.layout.shapes] == ["rect", "rect", "line"]
+        assert [(s.y0, s.y1) for s in fig.layout.shapes] == [(98.5, 101.5), (99.0, 101.0), (100.0, 100.0)]
+        assert [a.text for a in fig.layout.annotations] == ["Mean (100)", "P10 (98)", "P90 (102)"]
+
+
+class TestCachedCharts:
+    """Тесты кэширующих обёрток create_*_chart"""
+
+    def _ytm_frame(self, shift: float = 0.0) -> pd.DataFrame:
+        index = pd.date_range("2026-01-01", periods=10, freq="D")
+        return pd.DataFrame(
+            {"ОФЗ 26221": [15.0 + shift + i * 0.01 for i in range(10)]},
+            index=index,
+        )
+
+    def test_same_data_returns_equal_figure(self):
+        """Одинаковые данные дают одинаковую фигуру"""
+        from components.charts import create_ytm_chart
+
+        fig1 = create_ytm_chart(self._ytm_frame())
+        fig2 = create_ytm_chart(self._ytm_frame())
+
+        assert json.loads(fig1.to_json()) == json.loads(fig2.to_json())
+
+    def test_changed_data_rebuilds_figure(self):
+        """Изменённые данные не попадают в старый кэш"""
+        from components.charts import create_ytm_chart
+
+        fig1 = create_ytm_chart(self._ytm_frame())
+        fig2 = create_ytm_chart(self._ytm_frame(shift=1.0))
+
+        assert json.loads(fig1.to_json()) != json.loads(fig2.to_json())
+
+    def test_backtest_chart_cached(self):
+        """Результат бэктеста (dataclass с позициями) хэшируется для кэша"""
+        from components.charts import create_backtest_chart
+        from core.backtest import BacktestResult, Position
+        from core.signals import SignalDirection
+
+        def make_result():
+            position = Position(
+                pair_name="A_B", direction=list(SignalDirection)[0],
+                entry_date=date(2026, 1, 5), entry_spread=100.0,
+                entry_ytm_long=15.0, entry_ytm_short=14.0, size=1_000_000,
+                pnl_bp=5.0,
+            )
+            return BacktestResult(total_trades=1, positions=[position], equity_curve=[1.0, 1.1])
+
+        fig1 = create_backtest_chart(make_result())
+        fig2 = create_backtest_chart(make_result())
+
+        assert json.loads(fig1.to_json()) == json.loads(fig2.to_json())
+
+
+class TestSignalChart:
+    """Тесты графика сигналов"""
+
+    def test_percentile_lines(self):
+        """Линии P10/P90 совпадают с перцентилями окна"""
+        import numpy as np
+
+        index = pd.date_range("2025-01-01", periods=300, freq="D")
+        spread = pd.Series(np.linspace(50.0, 150.0, 300), index=index)
+
+        fig = ChartBuilder().create_signal_chart(spread, [])
+
+        lines = [s for s in fig.layout.shapes if s.type == "line"]
+        window = spread.tail(252)
+        assert lines[0].y0 == pytest.approx(window.quantile(0.1))
+        assert lines[1].y0 == pytest.approx(window.quantile(0.9))
+
+    def test_zones_and_lines_in_layout(self):
+        """Зоны и линии перцентилей заданы списком shapes/annotations в layout"""
+        import numpy as np
+
+        index = pd.date_range("2025-01-01", periods=300, freq="D")
+        spread = pd.Series(np.linspace(50.0, 150.0, 300), index=index)
+
+        fig = ChartBuilder().create_signal_chart(spread, [])
+
+        assert [s.type for s in fig.layout.shapes] == ["rect", "rect", "line", "line"]
+        assert [a.text for a in fig.layout.annotations] == [
+            "Покупка", "Продажа", "P10=74", "P90=142"
+        ]
+        window = spread.tail(252)
+        buy_zone = fig.layout.shapes[0]
+        assert buy_zone.y0 == pytest.approx(window.min() - 5)
+        assert buy_zone.y1 == pytest.approx(window.quantile(0.25))
+
+
+    def test_empty_series(self):
+        """Пустой ряд даёт пустой график без ошибок"""
+        fig = ChartBuilder().create_signal_chart(pd.Series(dtype=float), [])
+
+        assert len(fig.data) == 0
+        assert fig.layout.shapes == ()
+        assert fig.layout.title.text == "Сигналы на спреде"
+
+
+class TestBacktestChart:
+    """Тесты графика бэктеста"""
+
+    def test_pnl_bar_colors(self):
+        """Цвета столбцов P&L зависят от знака"""
+        from core.backtest import BacktestResult
+
+        @dataclass
+        class FakePosition:
+            pnl_bp: float
+
+        result = BacktestResult(
+            total_trades=3,
+            positions=[FakePosition(5.0), FakePosition(-2.0), FakePosition(0.0)],
+            equity_curve=[1_000_000.0, 1_000_500.0],
+        )
+
+        fig = ChartBuilder().create_backtest_chart(result)
+
+        bar = next(t for t in fig.data if t.type == "bar")
+        assert list(bar.marker.color) == ["green", "red", "red"]
+        assert list(bar.x) == [1, 2, 3]
+
+
+    def test_traces_placed_in_subplots(self):
+        """Трейсы попадают в свои ячейки сетки"""
+        from core.backtest import BacktestResult
+
+        @dataclass
+        class FakePosition:
+            pnl_bp: float
+
+        result = BacktestResult(
+            total_trades=2,
+            positions=[FakePosition(5.0), FakePosition(-2.0)],
+            equity_curve=[1_000_000.0, 1_000_500.0],
+        )
+
+        fig = ChartBuilder().create_backtest_chart(result)
+
+        types = [t.type for t in fig.data]
+        assert types == ["scatter", "histogram", "bar", "table"]
+        assert fig.data[0].xaxis == "x" and fig.data[2].xaxis == "x3"
+
+class TestYtmChart:
+    """Тесты графика YTM"""
+
+    def test_legend_names_with_info(self):
+        """В легенду попадают только заполненные поля"""
+        index = pd.date_range("2026-01-01", periods=3, freq="D")
+        ytm = pd.DataFrame({"A": [15.0, 15.1, 15.2], "B": [14.0, 14.1, 14.2]}, index=index)
+        bonds_info = {
+            "A": {"years_to_maturity": 7.25, "current_ytm": 15.2, "duration_years": 5.0},
+            "B": {"years_to_maturity": 3.0, "current_ytm": None},
+        }
+
+        fig = ChartBuilder().create_ytm_chart(ytm, bonds_info=bonds_info)
+
+        assert fig.data[0].name == "A | 7.2г. | YTM: 15.20% | D: 5.0"
+        assert fig.data[1].name == "B | 3.0г."
+
+    def test_legend_names_without_info(self):
+        """Без bonds_info в легенде имя колонки"""
+        index = pd.date_range("2026-01-01", periods=3, freq="D")
+        ytm = pd.DataFrame({"A": [15.0, 15.1, 15.2]}, index=index)
+
+        fig = ChartBuilder().create_ytm_chart(ytm)
+
+        assert fig.data[0].name == "A"
+
+    def test_y_range_ignores_nan(self):
+        """Диапазон Y считается по заполненным значениям"""
+        index = pd.date_range("2026-01-01", periods=3, freq="D")
+        ytm = pd.DataFrame({"A": [15.0, None, 16.0], "B": [None, 14.0, None]}, index=index)
+
+        fig = ChartBuilder().create_ytm_chart(ytm)
+
+        assert list(fig.layout.yaxis.range) == pytest.approx([13.8, 16.2])
+
+    def test_y_range_all_nan(self):
+        """Без данных диапазон Y не задаётся"""
+        index = pd.date_range("2026-01-01", periods=2, freq="D")
+        ytm = pd.DataFrame({"A": [None, None]}, index=index, dtype=float)
+
+        fig = ChartBuilder().create_ytm_chart(ytm)
+
+        assert fig.layout.yaxis.range is None
+
+    def test_line_values_float32(self):
+        """Значения линий передаются как float32 без потери нужной точности"""
+        import numpy as np
+
+        index = pd.date_range("2026-01-01", periods=3, freq="D")
+        ytm = pd.DataFrame({"A": [15.01, 15.12, 15.23]}, index=index)
+
+        fig = ChartBuilder().create_ytm_chart(ytm)
+
+        assert fig.data[0].y.dtype == np.float32
+        assert np.round(fig.data[0].y, 2).tolist() == pytest.approx([15.01, 15.12, 15.23])
+
+    def test_dates_as_epoch_ms(self):
+        """Даты передаются миллисекундами от эпохи на оси типа date"""
+        index = pd.date_range("2026-01-01", periods=3, freq="D")
+        ytm = pd.DataFrame({"A": [15.0, 15.1, 15.2], "B": [14.0, 14.1, 14.2]}, index=index)
+
+        fig = ChartBuilder().create_ytm_chart(ytm)
+
+        assert fig.layout.xaxis.type == "date"
+        expected = [ts.value // 10**6 for ts in index]
+        assert list(fig.data[0].x) == expected
+        assert list(fig.data[1].x) == expected
+
+    def test_tz_aware_dates_as_epoch_ms(self):
+        """tz-aware индекс: ось date, местное время в миллисекундах"""
+        index = pd.date_range("2026-01-01 10:00", periods=3, freq="h", tz="Europe/Moscow")
+        ytm = pd.DataFrame({"A": [15.0, 15.1, 15.2]}, index=index)
+
+        fig = ChartBuilder().create_ytm_chart(ytm)
+
+        assert fig.layout.xaxis.type == "date"
+        expected = [ts.value // 10**6 for ts in index.tz_localize(None)]
+        assert list(fig.data[0].x) == expected
+
+    def test_object_dates_long_series(self):
+        """Индекс из datetime.date длиннее max_points: ось date, ряд прорежен"""
+        import numpy as np
+
+        max_points = 300
+        index = pd.date_range("2020-01-01", periods=max_points + 1, freq="D")
+        values = np.sin(np.linspace(0, 10, max_points + 1))
+        dates = pd.Index([ts.date() for ts in index])
+        builder = ChartBuilder()
+
+        spread = builder.create_spread_chart(pd.DataFrame({"A_B": values}, index=dates), max_points=max_points)
+        signal = builder.create_signal_chart(pd.Series(values, index=dates), [], max_points=max_points)
+        expected = builder.create_spread_chart(pd.DataFrame({"A_B": values}, index=index), max_points=max_points)
+
+        for fig in (spread, signal):
+            assert fig.layout.xaxis.type == "date"
+            assert len(fig.data[0].x) == max_points
+            assert list(fig.data[0].x) == list(expected.data[0].x)
+
+    def test_tz_aware_long_series(self):
+        """tz-aware индекс длиннее max_points не ломает построение"""
+        import numpy as np
+
+        max_points = 300
+        index = pd.date_range("2026-01-01 10:00", periods=max_points + 1,
+                              freq="min", tz="Europe/Moscow")
+        ytm = pd.DataFrame({"A": np.linspace(14, 15, max_points + 1)}, index=index)
+
+        fig = ChartBuilder().create_ytm_chart(ytm, max_points=max_points)
+
+        assert fig.layout.xaxis.type == "date"
+        assert len(fig.data[0].x) == max_points
+        assert fig.data[0].x[0] == index[0].tz_localize(None).value // 10**6
+
+    def test_webgl_for_many_points(self):
+        """Большой график рисуется через WebGL, небольшой - SVG"""
+        import numpy as np
+
+        index = pd.date_range("2020-01-01", periods=2000, freq="D")
+        wide = pd.DataFrame({f"B{i}": np.linspace(14, 16, 2000) for i in range(6)}, index=index)
+
+        builder = ChartBuilder()
+        assert {t.type for t in builder.create_ytm_chart(wide).data} == {"scattergl"}
+        assert {t.type for t in builder.create_ytm_chart(wide.iloc[:, :2]).data} == {"scatter"}
+
+    def test_y_range_empty_frame(self):
+        """Пустой DataFrame не ломает расчёт диапазона"""
+        ytm = pd.DataFrame({"A": []}, index=pd.DatetimeIndex([]), dtype=float)
+
+        fig = ChartBuilder().create_ytm_chart(ytm)
+
+        assert fig.layout.yaxis.range is None
+
+
+class TestExchangeStatusCard:
+    """Тесты карточки статуса биржи"""
+
+    def test_card_shows_seconds(self):
+        """Карточка показывает время обновления с секундами"""
+        builder = ChartBuilder()
+        html = builder.create_exchange_status_card(
+            "OPEN", True, "Биржа открыта", datetime(2026, 2, 27, 11, 42, 17)
+        )
+
+        assert "Обновлено: 11:42:17" in html
+        assert "🟢" in html
+
+    def test_card_closed(self):
+        """Закрытая биржа - красный индикатор"""
+        html = ChartBuilder().create_exchange_status_card(
+            "CLOSED", False, "Биржа закрыта", datetime(2026, 2, 27, 20, 0)
+        )
+
+        assert "🔴" in html
+        assert "#dc3545" in html
+
@@ -0,0 +1,64 @@
+"""
+Тесты для modes/base.py
+
+Запуск:
+    python3 -m pytest tests/test_daily_mode.py
+"""
+import sys
+import os
+import unittest
+from unittest.mock import Mock
+
+# Добавляем родительскую директорию в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import AppConfig
+from modes.base import DailyMode
+
+
+class TestDailyTradingData(unittest.TestCase):
+    """Торговые данные дневного режима"""
+
+    def test_trading_data_fetched_in_one_batch(self):
+        """Все облигации запрашиваются одним батч-вызовом"""
+        mode = DailyMode(AppConfig())
+        isins = list(mode.config.bonds)
+        batch = {isin: {"isin": isin, "has_data": False} for isin in isins}
+        batch[isins[0]] = {"isin": isins[0], "has_data": True, "yield": 14.2, "duration": 1500}
+        mode.history_fetcher = Mock()
+        mode.history_fetcher.get_trading_data_batch.return_value = batch
+
+        ytm_data = mode._fetch_trading_data()
+
+        mode.history_fetcher.get_trading_data_batch.assert_called_once_with(isins)
+        mode.history_fetcher.get_trading_data.assert_not_called()
+        self.assertEqual(list(ytm_data), [isins[0]])
+        self.assertEqual(ytm_data[isins[0]]["ytm"].iloc[0], 14.2)
+        self.assertEqual(ytm_data[isins[0]]["duration_days"].iloc[0], 1500)
+
+    def test_batch_failure_leaves_no_data(self):
+        """Сбой батч-запроса не роняет режим - торговых данных просто нет"""
+        mode = DailyMode(AppConfig())
+        mode.history_fetcher = Mock()
+        mode.history_fetcher.get_trading_data_batch.side_effect = TypeError("bad isin")
+
+        self.assertEqual(mode._fetch_trading_data(), {})
+
+    def test_bad_bond_does_not_drop_others(self):
+        """Ошибка разбора одной облигации не теряет данные остальных"""
+        mode = DailyMode(AppConfig())
+        isins = list(mode.config.bonds)
+        bad = Mock()
+        bad.get.side_effect = ValueError("broken row")
+        batch = {isins[0]: bad}
+        batch[isins[1]] = {"isin": isins[1], "has_data": True, "yield": 14.2, "duration": 1500}
+        mode.history_fetcher = Mock()
+        mode.history_fetcher.get_trading_data_batch.return_value = batch
+
+        ytm_data = mode._fetch_trading_data()
+
+        self.assertEqual(list(ytm_data), [isins[1]])
+
+
+if __name__ == "__main__":
+    unittest.main()
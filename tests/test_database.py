@@ -588,6 +588,54 @@ def test_database():
             len(loaded_60min) >= 50  # Минимум исходные 50 записей
         )
         
+        # ==========================================
+        # ТЕСТ 20: Сохранение в одной транзакции
+        # ==========================================
+        print(f"{Colors.BOLD}--- Транзакция ---{Colors.END}\n")
+        
+        with db.transaction():
+            db.save_daily_ytm('TEST00000001', daily_ytm_df)
+            db.save_intraday_ytm('TEST00000001', '60', intraday_ytm_df)
+        
+        run_test(
+            "Данные транзакции сохранены",
+            "30 / 50",
+            f"{len(db.load_daily_ytm('TEST00000001'))} / {len(db.load_intraday_ytm('TEST00000001', '60'))}",
+            len(db.load_daily_ytm('TEST00000001')) == 30
+            and len(db.load_intraday_ytm('TEST00000001', '60')) == 50
+        )
+        
+        # Ошибка внутри блока откатывает все сохранения
+        try:
+            with db.transaction():
+                db.save_daily_ytm('TEST00000002', daily_ytm_df)
+                raise RuntimeError("прерывание обновления")
+        except RuntimeError:
+            pass
+        
+        run_test(
+            "Откат транзакции при ошибке",
+            "0 записей",
+            f"{len(db.load_daily_ytm('TEST00000002'))} записей",
+            db.load_daily_ytm('TEST00000002').empty
+        )
+
+        # Непривязываемая строка в середине пакета: остальные строки
+        # сохраняются, счётчик совпадает с тем, что реально записано
+        bad_df = daily_ytm_df.head(5).astype({'ytm': object})
+        bad_df.iloc[2, bad_df.columns.get_loc('ytm')] = [14.5]
+
+        with db.transaction():
+            saved_bad = db.save_daily_ytm('TEST00000003', bad_df)
+
+        loaded_bad = db.load_daily_ytm('TEST00000003')
+        run_test(
+            "Пропуск ошибочной строки в транзакции",
+            "4 / 4",
+            f"{saved_bad} / {len(loaded_bad)}",
+            saved_bad == 4 and len(loaded_bad) == 4
+        )
+
         # ==========================================
         # ТЕСТ 12: Удаление старых данных
         # ==========================================
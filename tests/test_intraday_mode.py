@@ -0,0 +1,59 @@
+"""
+Тесты для modes/intraday.py
+
+Запуск:
+    python3 -m pytest tests/test_intraday_mode.py
+"""
+import sys
+import os
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+# Добавляем родительскую директорию в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import AppConfig
+from modes.intraday import IntradayMode
+
+
+def make_mode():
+    """IntradayMode с замоканными источниками данных (биржа открыта, данных нет)"""
+    mode = IntradayMode(AppConfig())
+    mode.trading_checker = Mock()
+    mode.trading_checker.check_comprehensive.return_value = Mock(is_trading=True)
+    mode.candle_fetcher = Mock()
+    mode.candle_fetcher.fetch_multi_bonds_candles.return_value = {}
+    mode.history_fetcher = Mock()
+    mode.history_fetcher.fetch_multi_bonds_history.return_value = {}
+    return mode
+
+
+class TestIntradayHistoryCache(unittest.TestCase):
+    """История для перцентилей кэшируется на cache_ttl_seconds"""
+
+    def test_history_fetched_once_within_ttl(self):
+        """Повторный запуск в пределах TTL не запрашивает историю"""
+        mode = make_mode()
+
+        mode.run()
+        mode.refresh()
+
+        self.assertEqual(mode.history_fetcher.fetch_multi_bonds_history.call_count, 1)
+        self.assertEqual(mode.candle_fetcher.fetch_multi_bonds_candles.call_count, 2)
+
+    def test_history_refetched_after_ttl(self):
+        """После истечения TTL история запрашивается заново"""
+        mode = make_mode()
+
+        mode.run()
+        mode._history_loaded_at = datetime.now() - timedelta(
+            seconds=mode.config.cache_ttl_seconds + 1
+        )
+        mode.run()
+
+        self.assertEqual(mode.history_fetcher.fetch_multi_bonds_history.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
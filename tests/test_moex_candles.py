@@ -0,0 +1,59 @@
+"""
+Тесты для api/moex_candles.py
+
+Запуск:
+    python3 -m pytest tests/test_moex_candles.py
+"""
+import sys
+import os
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+# Добавляем родительскую директорию в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.moex_candles import CandleFetcher
+from config import AppConfig
+
+
+class TestCandleYtm(unittest.TestCase):
+    """Тесты расчёта YTM по свечам"""
+
+    def setUp(self):
+        self.fetcher = CandleFetcher()
+        self.bond = AppConfig().bonds["SU26221RMFS0"]
+        self.df = pd.DataFrame({
+            "open": [80.0, 80.1, 80.1],
+            "high": [80.2, 80.2, 80.3],
+            "low": [79.9, 80.0, 80.0],
+            "close": [80.1, 80.1, 80.2],
+        })
+
+    @patch.object(CandleFetcher, "_get_accrued_interest", return_value=10.0)
+    def test_ytm_solved_once_per_unique_price(self, mock_accrued):
+        """YTM считается один раз на уникальную цену"""
+        calculator = self.fetcher._ytm_calculator
+        with patch.object(calculator, "calculate_ytm", wraps=calculator.calculate_ytm) as spy:
+            result = self.fetcher._calculate_ytm_for_dataframe(self.df.copy(), self.bond)
+
+        unique_prices = set(self.df.to_numpy().ravel())
+        self.assertEqual(spy.call_count, len(unique_prices))
+        self.assertEqual(result["ytm_close"].dtype, float)
+        self.assertEqual(result.loc[1, "ytm_open"], result.loc[0, "ytm_close"])
+        self.assertTrue(result["ytm"].equals(result["ytm_close"]))
+
+    @patch.object(CandleFetcher, "_get_accrued_interest", return_value=10.0)
+    def test_non_positive_price_gives_nan(self, mock_accrued):
+        """Нулевая цена даёт NaN вместо YTM"""
+        self.df.loc[2, "low"] = 0.0
+
+        result = self.fetcher._calculate_ytm_for_dataframe(self.df.copy(), self.bond)
+
+        self.assertTrue(pd.isna(result.loc[2, "ytm_low"]))
+        self.assertFalse(result["ytm_close"].isna().any())
+
+
+if __name__ == "__main__":
+    unittest.main()
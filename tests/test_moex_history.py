@@ -0,0 +1,110 @@
+"""
+Тесты для api/moex_history.py
+
+Запуск:
+    python3 -m pytest tests/test_moex_history.py
+"""
+import sys
+import os
+import unittest
+from unittest.mock import Mock, patch
+
+# Добавляем родительскую директорию в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.moex_history import HistoryFetcher
+
+
+MARKETDATA_COLUMNS = ["SECID", "BOARDID", "YIELD", "DURATION", "MARKETPRICE"]
+
+
+def make_response(rows):
+    """Ответ MOEX с блоком marketdata"""
+    response = Mock()
+    response.json.return_value = {
+        "marketdata": {"columns": MARKETDATA_COLUMNS, "data": rows}
+    }
+    return response
+
+
+class TestTradingDataBatch(unittest.TestCase):
+    """Тесты для get_trading_data_batch"""
+
+    def setUp(self):
+        self.fetcher = HistoryFetcher()
+
+    def tearDown(self):
+        self.fetcher.close()
+
+    @patch('api.moex_history.HistoryFetcher._make_request')
+    def test_batch_matches_single_format(self, mock_request):
+        """Пакетный запрос возвращает данные в формате get_trading_data"""
+        mock_request.return_value = make_response([
+            ["SU26221RMFS0", "TQOB", 14.5, 2922.0, 71.3],
+            ["SU26225RMFS1", "TQOB", None, None, None],
+        ])
+
+        result = self.fetcher.get_trading_data_batch(["SU26221RMFS0", "SU26225RMFS1", "SU26230RMFS1"])
+
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertEqual(
+            mock_request.call_args[0][1]["securities"],
+            "SU26221RMFS0,SU26225RMFS1,SU26230RMFS1"
+        )
+        self.assertTrue(result["SU26221RMFS0"]["has_data"])
+        self.assertEqual(result["SU26221RMFS0"]["yield"], 14.5)
+        self.assertAlmostEqual(result["SU26221RMFS0"]["duration_years"], 2922.0 / 365.25)
+        self.assertEqual(result["SU26225RMFS1"], {"isin": "SU26225RMFS1", "has_data": False})
+        self.assertEqual(result["SU26230RMFS1"], {"isin": "SU26230RMFS1", "has_data": False})
+
+    @patch('api.moex_history.HistoryFetcher._make_request')
+    def test_batch_split_by_size(self, mock_request):
+        """Длинный список ISIN разбивается на запросы по TRADING_BATCH_SIZE"""
+        mock_request.return_value = make_response([])
+        isins = [f"SU{i:05d}RMFS0" for i in range(HistoryFetcher.TRADING_BATCH_SIZE + 1)]
+
+        result = self.fetcher.get_trading_data_batch(isins)
+
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertEqual(set(result), set(isins))
+
+    @patch('api.moex_history.HistoryFetcher._make_request')
+    def test_batch_error(self, mock_request):
+        """Ошибка запроса помечается для всех бумаг пакета"""
+        mock_request.side_effect = Exception("timeout")
+
+        result = self.fetcher.get_trading_data_batch(["SU26221RMFS0"])
+
+        self.assertFalse(result["SU26221RMFS0"]["has_data"])
+        self.assertEqual(result["SU26221RMFS0"]["error"], "timeout")
+
+    @patch('api.moex_history.HistoryFetcher._make_request')
+    def test_batch_error_only_affects_its_chunk(self, mock_request):
+        """Ошибка одной пачки не затрагивает бумаги других пачек"""
+        size = HistoryFetcher.TRADING_BATCH_SIZE
+        isins = [f"SU{i:05d}RMFS0" for i in range(size + 1)]
+        mock_request.side_effect = [
+            Exception("timeout"),
+            make_response([[isins[-1], "TQOB", 14.5, 2922.0, 71.3]]),
+        ]
+
+        result = self.fetcher.get_trading_data_batch(isins)
+
+        self.assertTrue(all(result[isin].get("error") == "timeout" for isin in isins[:size]))
+        self.assertTrue(result[isins[-1]]["has_data"])
+
+    @patch('api.moex_history.HistoryFetcher._make_request')
+    def test_batch_skips_empty_isins(self, mock_request):
+        """Пустые ISIN не попадают в запрос и возвращаются без данных"""
+        mock_request.return_value = make_response([["SU26221RMFS0", "TQOB", 14.5, 2922.0, 71.3]])
+
+        result = self.fetcher.get_trading_data_batch([None, "SU26221RMFS0", ""])
+
+        self.assertEqual(mock_request.call_args[0][1]["securities"], "SU26221RMFS0")
+        self.assertTrue(result["SU26221RMFS0"]["has_data"])
+        self.assertEqual(result[None], {"isin": None, "has_data": False})
+        self.assertEqual(result[""], {"isin": "", "has_data": False})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -265,17 +265,7 @@ class TestSidebarBondItemClass:
 
     def test_bond_item_attributes(self):
         """Проверяем атрибуты BondItem"""
-        # Имитируем класс BondItem из app.py
-        class BondItem:
-            def __init__(self, data):
-                self.isin = data.get('isin')
-                self.name = data.get('name', '')
-                self.maturity_date = data.get('maturity_date', '')
-                self.coupon_rate = data.get('coupon_rate')
-                self.face_value = data.get('face_value', 1000)
-                self.coupon_frequency = data.get('coupon_frequency', 2)
-                self.issue_date = data.get('issue_date', '')
-                self.day_count_convention = data.get('day_count_convention', 'ACT/ACT')
+        from app import BondItem
 
         bond_data = {
             'isin': 'SU26221RMFS0',
@@ -288,7 +278,7 @@ class TestSidebarBondItemClass:
             'day_count_convention': 'ACT/ACT'
         }
 
-        bond = BondItem(bond_data)
+        bond = BondItem.from_dict(bond_data)
 
         assert bond.isin == 'SU26221RMFS0'
         assert bond.name == 'ОФЗ 26221'
@@ -301,25 +291,32 @@ class TestSidebarBondItemClass:
 
     def test_bond_item_defaults(self):
         """Проверяем значения по умолчанию BondItem"""
-        class BondItem:
-            def __init__(self, data):
-                self.isin = data.get('isin')
-                self.name = data.get('name', '')
-                self.maturity_date = data.get('maturity_date', '')
-                self.coupon_rate = data.get('coupon_rate')
-                self.face_value = data.get('face_value', 1000)
-                self.coupon_frequency = data.get('coupon_frequency', 2)
-                self.issue_date = data.get('issue_date', '')
-                self.day_count_convention = data.get('day_count_convention', 'ACT/ACT')
-
-        bond = BondItem({'isin': 'TEST'})
-
-        assert bond.name == ''
+        from app import BondItem
+
+        bond = BondItem.from_dict({'isin': 'TEST'})
+
+        assert bond.name == 'TEST'  # без названия - ISIN
         assert bond.maturity_date == ''
         assert bond.coupon_rate is None
         assert bond.face_value == 1000
         assert bond.coupon_frequency == 2
 
+    def test_bond_item_empty_name_falls_back_to_isin(self):
+        """Пустое или None название заменяется на ISIN"""
+        from app import BondItem
+
+        assert BondItem.from_dict({'isin': 'SU1', 'name': None}).name == 'SU1'
+        assert BondItem.from_dict({'isin': 'SU1', 'name': 'ОФЗ 1'}).name == 'ОФЗ 1'
+        assert BondItem.from_dict({}).name == ''
+
+    def test_bond_item_slots(self):
+        """BondItem - slotted dataclass без __dict__"""
+        from app import BondItem
+
+        bond = BondItem.from_dict({'isin': 'TEST'})
+
+        assert not hasattr(bond, '__dict__')
+
 
 # ==========================================
 # ТЕСТЫ РАСЧЁТА ЛЕТ ДО ПОГАШЕНИЯ
@@ -330,12 +327,7 @@ class TestYearsToMaturity:
 
     def test_get_years_to_maturity_future(self):
         """Годы до погашения в будущем"""
-        def get_years_to_maturity(maturity_str):
-            try:
-                maturity = datetime.strptime(maturity_str, '%Y-%m-%d')
-                return round((maturity - datetime.now()).days / 365.25, 1)
-            except:
-                return 0
+        from app import get_years_to_maturity
 
         # Дата через 10 лет
         future_date = (datetime.now() + timedelta(days=3650)).strftime('%Y-%m-%d')
@@ -345,12 +337,7 @@ class TestYearsToMaturity:
 
     def test_get_years_to_maturity_past(self):
         """Годы до погашения в прошлом (погашенная облигация)"""
-        def get_years_to_maturity(maturity_str):
-            try:
-                maturity = datetime.strptime(maturity_str, '%Y-%m-%d')
-                return round((maturity - datetime.now()).days / 365.25, 1)
-            except:
-                return 0
+        from app import get_years_to_maturity
 
         # Дата в прошлом
         past_date = "2020-01-01"
@@ -360,16 +347,18 @@ class TestYearsToMaturity:
 
     def test_get_years_to_maturity_invalid(self):
         """Неверный формат даты"""
-        def get_years_to_maturity(maturity_str):
-            try:
-                maturity = datetime.strptime(maturity_str, '%Y-%m-%d')
-                return round((maturity - datetime.now()).days / 365.25, 1)
-            except:
-                return 0
+        from app import get_years_to_maturity
 
         years = get_years_to_maturity("invalid-date")
         assert years == 0
 
+    def test_get_years_to_maturity_empty(self):
+        """Пустая или отсутствующая дата погашения"""
+        from app import get_years_to_maturity
+
+        assert get_years_to_maturity("") == 0
+        assert get_years_to_maturity(None) == 0
+
 
 # ==========================================
 # ТЕСТЫ ФОРМАТИРОВАНИЯ МЕТКИ
@@ -380,29 +369,12 @@ class TestFormatBondLabel:
 
     def test_format_with_all_data(self):
         """Форматирование с полными данными"""
-        def get_years_to_maturity(maturity_str):
-            try:
-                maturity = datetime.strptime(maturity_str, '%Y-%m-%d')
-                return round((maturity - datetime.now()).days / 365.25, 1)
-            except:
-                return 0
+        from app import BondItem, format_bond_label
 
-        def format_bond_label(bond, ytm=None, duration_years=None):
-            years = get_years_to_maturity(bond['maturity_date'])
-            parts = [f"{bond['name']}"]
-
-            if ytm is not None:
-                parts.append(f"YTM: {ytm:.2f}%")
-            if duration_years is not None:
-                parts.append(f"Дюр: {duration_years:.1f}г.")
-            parts.append(f"{years}г. до погашения")
-
-            return " | ".join(parts)
-
-        bond = {
+        bond = BondItem.from_dict({
             'name': 'ОФЗ 26221',
             'maturity_date': (datetime.now() + timedelta(days=3650)).strftime('%Y-%m-%d')
-        }
+        })
 
         label = format_bond_label(bond, ytm=7.5, duration_years=8.2)
 
@@ -413,29 +385,12 @@ class TestFormatBondLabel:
 
     def test_format_without_ytm_duration(self):
         """Форматирование без YTM и дюрации"""
-        def get_years_to_maturity(maturity_str):
-            try:
-                maturity = datetime.strptime(maturity_str, '%Y-%m-%d')
-                return round((maturity - datetime.now()).days / 365.25, 1)
-            except:
-                return 0
-
-        def format_bond_label(bond, ytm=None, duration_years=None):
-            years = get_years_to_maturity(bond['maturity_date'])
-            parts = [f"{bond['name']}"]
-
-            if ytm is not None:
-                parts.append(f"YTM: {ytm:.2f}%")
-            if duration_years is not None:
-                parts.append(f"Дюр: {duration_years:.1f}г.")
-            parts.append(f"{years}г. до погашения")
+        from app import BondItem, format_bond_label
 
-            return " | ".join(parts)
-
-        bond = {
+        bond = BondItem.from_dict({
             'name': 'ОФЗ 26221',
             'maturity_date': (datetime.now() + timedelta(days=3650)).strftime('%Y-%m-%d')
-        }
+        })
 
         label = format_bond_label(bond)
 
@@ -444,6 +399,17 @@ class TestFormatBondLabel:
         assert 'Дюр:' not in label
         assert 'г. до погашения' in label
 
+    def test_format_ytm_only(self):
+        """Форматирование с YTM без дюрации"""
+        from app import BondItem, format_bond_label
+
+        bond = BondItem.from_dict({'name': 'ОФЗ 26221', 'maturity_date': '2033-03-23'})
+
+        label = format_bond_label(bond, ytm=7.5)
+
+        assert label.startswith('ОФЗ 26221 | YTM: 7.50% | ')
+        assert 'Дюр:' not in label
+
 
 def run_tests():
     """Запуск всех тестов"""
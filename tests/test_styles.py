@@ -0,0 +1,38 @@
+"""
+Тесты для CSS стилей (components/styles.py)
+
+Запуск:
+    pytest tests/test_styles.py -v
+"""
+import sys
+import os
+from unittest.mock import patch
+
+# Добавляем родительскую директорию в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from components.styles import CSS_STYLES, MINIFIED_CSS, apply_styles
+
+
+class TestStyles:
+    """Тесты минификации и вставки CSS"""
+
+    def test_minified_has_no_newlines(self):
+        """Минифицированный CSS без переносов и повторных пробелов"""
+        assert "\n" not in MINIFIED_CSS
+        assert "  " not in MINIFIED_CSS
+        assert len(MINIFIED_CSS) < len(CSS_STYLES)
+
+    def test_minified_keeps_rules(self):
+        """Все классы сохраняются после минификации"""
+        assert MINIFIED_CSS.startswith("<style>")
+        assert MINIFIED_CSS.endswith("</style>")
+        for selector in (".main-header", ".stats-grid", ".mode-intraday"):
+            assert selector in MINIFIED_CSS
+
+    def test_apply_styles_injects_minified(self):
+        """apply_styles вставляет минифицированный CSS"""
+        with patch("components.styles.st.markdown") as markdown:
+            apply_styles()
+
+        markdown.assert_called_once_with(MINIFIED_CSS, unsafe_allow_html=True)